@@ -0,0 +1,222 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from common.columnar import mapped_frame
+from common.profile import Profile, load_profile as _load_profile, write_profile as _write_profile
+from common.schema import compact
+from andrii.search import SearchIndex, cached_search_index
+from common.store import shared, shared_frame
+from common.trace import traced
+
+filepath = "data/andrii/netflix_titles.csv"
+centroids_path = "data/andrii/country_centroids.csv"
+aliases_path = "data/andrii/country_aliases.csv"
+
+# Bump when preprocess_data changes so the mapped frame gets rebuilt
+DATA_VERSION = 1
+
+# Keys counted in the dataset profile
+PROFILE_GROUPS = [["type"], ["country"], ["release_year"]]
+
+# Comma separated many-to-many columns, indexed per value
+FACETS = ["country", "listed_in", "cast", "director"]
+
+# Placeholder preprocess_data fills in, not a real value
+MISSING = {
+    "title": "Untitled",
+    "type": "Unknown",
+    "director": "Unknown",
+    "cast": "Unknown",
+    "country": "Unknown",
+    "rating": "Not Rated",
+    "duration": "Unknown",
+    "listed_in": "Unknown",
+    "description": "No Description",
+}
+
+
+@traced
+def preprocess_data(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.dropna(subset=['show_id'])
+
+    df = df.fillna(MISSING)
+
+    df['date_added'] = pd.to_datetime(df['date_added'], errors='coerce')
+
+    df = df[df['release_year'].notnull()].copy()
+    df['release_year'] = df['release_year'].astype(int)
+
+    return df
+
+
+def load_data() -> pd.DataFrame:
+    # Preprocessed once per file version and mapped from an Arrow file by every
+    # process, shared by all sessions and must not be modified in place
+    return shared_frame(
+        "andrii/netflix",
+        filepath,
+        lambda: mapped_frame(
+            filepath,
+            "netflix",
+            lambda: compact(preprocess_data(pd.read_csv(filepath)), "netflix").reset_index(drop=True),
+            version=DATA_VERSION,
+        ),
+    )
+
+
+@dataclass
+class Facet:
+    """Title <-> value links of one many-to-many column.
+
+    Values are sorted and identified by their position (code). The titles
+    of code `i` are `titles[offsets[i]:offsets[i + 1]]`, sorted row
+    positions, so the links double as an inverted index.
+    """
+
+    values: np.ndarray
+    titles: np.ndarray
+    offsets: np.ndarray
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes + self.titles.nbytes + self.offsets.nbytes
+
+    def code(self, value: str) -> int | None:
+        i = int(np.searchsorted(self.values, value))
+        return i if i < len(self.values) and self.values[i] == value else None
+
+    def titles_of(self, values: list[str]) -> np.ndarray:
+        # Titles linked to any of `values`
+        codes = [c for c in map(self.code, values) if c is not None]
+        parts = [self.titles[self.offsets[c]:self.offsets[c + 1]] for c in codes]
+        return np.unique(np.concatenate(parts)) if parts else np.empty(0, dtype="int32")
+
+    def links(self) -> pd.DataFrame:
+        # The normalized (title, code) table
+        counts = np.diff(self.offsets)
+        return pd.DataFrame({
+            "title": self.titles,
+            "code": np.repeat(np.arange(len(self.values), dtype="int32"), counts),
+        })
+
+    def counts(self) -> pd.Series:
+        return pd.Series(np.diff(self.offsets), index=self.values).sort_values(ascending=False)
+
+
+def build_facet(column: pd.Series, skip: str | None = None) -> Facet:
+    exploded = column.astype(str).str.split(",").explode().str.strip()
+    exploded = exploded[(exploded != "") & (exploded != skip)]
+    # Row positions, so the frame must have a default RangeIndex
+    pairs = pd.DataFrame({"title": exploded.index, "value": exploded.to_numpy()}).drop_duplicates()
+
+    codes, values = pd.factorize(pairs["value"], sort=True)
+    order = np.lexsort((pairs["title"].to_numpy(), codes))
+    counts = np.bincount(codes, minlength=len(values))
+    return Facet(
+        values=np.asarray(values, dtype=object),
+        titles=pairs["title"].to_numpy()[order].astype("int32"),
+        offsets=np.concatenate([[0], np.cumsum(counts)]),
+    )
+
+
+@dataclass
+class NetflixIndex:
+    df: pd.DataFrame
+    facets: dict[str, Facet]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(facet.nbytes for facet in self.facets.values())
+
+    def positions(self, **selected: list[str]) -> np.ndarray:
+        """Rows matching every facet, e.g. positions(cast=[...], listed_in=[...]).
+        Several values of one facet match any of them."""
+        result = None
+        for facet, values in selected.items():
+            if not values:
+                continue
+            titles = self.facets[facet].titles_of(values)
+            result = titles if result is None else np.intersect1d(result, titles, assume_unique=True)
+        return np.arange(len(self.df)) if result is None else result
+
+    def select(self, **selected: list[str]) -> pd.DataFrame:
+        return self.df.iloc[self.positions(**selected)]
+
+
+@traced
+def build_index(df: pd.DataFrame) -> NetflixIndex:
+    return NetflixIndex(df, {facet: build_facet(df[facet], skip=MISSING[facet]) for facet in FACETS})
+
+
+def load_index() -> NetflixIndex:
+    return shared("andrii/netflix-index", filepath, lambda: build_index(load_data()))
+
+
+def load_search_index() -> SearchIndex:
+    return shared("andrii/netflix-search", filepath, lambda: cached_search_index(filepath, load_data(), DATA_VERSION))
+
+
+def read_country_lookup() -> pd.DataFrame:
+    # Every known name, aliases included, with its country and centroid.
+    # keep_default_na keeps Namibia's "NA" code from turning into NaN
+    centroids = pd.read_csv(centroids_path, keep_default_na=False)
+    aliases = pd.read_csv(aliases_path, keep_default_na=False)
+    names = pd.concat([
+        pd.DataFrame({"name": centroids["country"], "country": centroids["country"]}),
+        aliases.rename(columns={"alias": "name"}),
+    ], ignore_index=True)
+    return names.merge(centroids, on="country", how="inner")
+
+
+def load_country_lookup() -> pd.DataFrame:
+    return shared_frame("andrii/country-lookup", [centroids_path, aliases_path], read_country_lookup)
+
+
+@traced
+def build_country_map(facet: Facet, lookup: pd.DataFrame) -> pd.DataFrame:
+    """Titles per country with the country centroid, aliases folded into
+    their country so e.g. West Germany counts towards Germany."""
+    names = pd.DataFrame({"name": facet.values}).merge(lookup, on="name", how="left")
+    links = facet.links()
+    links["country"] = names["country"].to_numpy()[links["code"].to_numpy()]
+    counts = (
+        links.dropna(subset=["country"])
+        .drop_duplicates(["title", "country"])
+        .groupby("country")
+        .size()
+        .rename("count")
+        .reset_index()
+    )
+    coords = lookup.loc[lookup["name"] == lookup["country"], ["country", "latitude", "longitude"]]
+    return (
+        counts.merge(coords, on="country")
+        .rename(columns={"latitude": "lat", "longitude": "lon"})
+        .sort_values("count", ascending=False, ignore_index=True)
+    )
+
+
+def load_country_map() -> pd.DataFrame:
+    return shared_frame(
+        "andrii/country-map",
+        [filepath, centroids_path, aliases_path],
+        lambda: build_country_map(load_index().facets["country"], load_country_lookup()),
+    )
+
+
+def write_profile() -> str:
+    return _write_profile(filepath, "netflix", load_data(), PROFILE_GROUPS, [])
+
+
+def load_profile() -> Profile | None:
+    return _load_profile(filepath, "netflix")
+
+
+def value_counts(df: pd.DataFrame, column: str) -> pd.Series:
+    # Titles per value, from the profile when it has them
+    profile = load_profile()
+    counts = profile.groups([column]) if profile is not None else None
+    if counts is None:
+        return df[column].value_counts()
+    return counts.set_index(column)["size"].rename("count")
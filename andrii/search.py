@@ -0,0 +1,186 @@
+import os
+import re
+import sys
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from common.columnar import cache_path, remove_stale, replace, temp_path
+
+# Searched columns and how much a match in each counts
+FIELDS = {"title": 3.0, "director": 2.0, "cast": 1.5, "description": 1.0}
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Bump when tokenization or the index layout change
+INDEX_VERSION = 2
+
+TOKEN_PATTERN = r"[^\W_]+"
+SUFFIXES = ("ingly", "edly", "ing", "ies", "ied", "ed", "es", "s")
+# A trailing "s" after these is part of the word ("boss", "virus", "this")
+KEEP_S = ("ss", "us", "is")
+
+# Word forms that must share a stem, checked by common.smoke
+SAME_STEM = [
+    ("detective", "detectives"),
+    ("love", "loves", "loved", "loving"),
+    ("story", "stories"),
+    ("movie", "movies"),
+    ("family", "families"),
+    ("boss", "bosses"),
+    ("house", "houses"),
+]
+
+
+def stem(token: str) -> str:
+    """Light suffix stripping, so that e.g. "detective" and "detectives" or
+    "story" and "stories" share a stem. A final "e" is dropped and a final
+    "y" after a consonant becomes "i", as "-ies" does."""
+    for suffix in SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            if suffix == "s" and token.endswith(KEEP_S):
+                break
+            token = token[: -len(suffix)] + ("i" if suffix in ("ies", "ied") else "")
+            break
+    if len(token) > 3 and token.endswith("e"):
+        return token[:-1]
+    if len(token) > 3 and token.endswith("y") and token[-2] not in "aeiou":
+        return token[:-1] + "i"
+    return token
+
+
+def stem_mismatches() -> list[tuple[str, ...]]:
+    # The SAME_STEM groups whose forms don't tokenize alike
+    return [forms for forms in SAME_STEM if len({tuple(tokenize(form)) for form in forms}) > 1]
+
+
+def tokenize(text: str, stemming: bool = True) -> list[str]:
+    tokens = re.findall(TOKEN_PATTERN, text.lower())
+    return [stem(t) for t in tokens] if stemming else tokens
+
+
+@dataclass
+class SearchIndex:
+    """BM25 inverted index. Postings of term `i` (position in the sorted
+    `terms`) are `docs[offsets[i]:offsets[i + 1]]` with their weighted term
+    frequencies in `tf`."""
+
+    terms: np.ndarray
+    docs: np.ndarray
+    tf: np.ndarray
+    offsets: np.ndarray
+    doc_len: np.ndarray
+    stemming: bool = True
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.nbytes for a in (self.terms, self.docs, self.tf, self.offsets, self.doc_len))
+
+    def search(self, query: str, limit: int = 20) -> tuple[np.ndarray, np.ndarray]:
+        """Row positions and scores of the best `limit` matches, best first."""
+        scores = np.zeros(len(self.doc_len), dtype="float32")
+        avgdl = self.doc_len.mean() if len(self.doc_len) else 1.0
+        for token in set(tokenize(query, self.stemming)):
+            i = int(np.searchsorted(self.terms, token))
+            if i == len(self.terms) or self.terms[i] != token:
+                continue
+            docs = self.docs[self.offsets[i]:self.offsets[i + 1]]
+            tf = self.tf[self.offsets[i]:self.offsets[i + 1]]
+            idf = np.log(1 + (len(self.doc_len) - len(docs) + 0.5) / (len(docs) + 0.5))
+            norm = K1 * (1 - B + B * self.doc_len[docs] / avgdl)
+            scores[docs] += idf * tf * (K1 + 1) / (tf + norm)
+
+        matched = np.flatnonzero(scores)
+        if len(matched) > limit:
+            matched = matched[np.argpartition(-scores[matched], limit)[:limit]]
+        best = matched[np.argsort(-scores[matched], kind="stable")]
+        return best, scores[best]
+
+    def save(self, path: str) -> None:
+        tmp = temp_path(path)
+        with open(tmp, "wb") as f:
+            np.savez(f, terms=self.terms.astype(str), docs=self.docs, tf=self.tf,
+                     offsets=self.offsets, doc_len=self.doc_len, stemming=self.stemming)
+        replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "SearchIndex":
+        with np.load(path) as data:
+            return cls(data["terms"], data["docs"], data["tf"], data["offsets"],
+                       data["doc_len"], bool(data["stemming"]))
+
+
+def build_search_index(df: pd.DataFrame, stemming: bool = True) -> SearchIndex:
+    # (doc, token, weight) for every token of every searched field
+    parts = []
+    for field, weight in FIELDS.items():
+        tokens = df[field].astype(str).str.lower().str.findall(TOKEN_PATTERN).explode().dropna()
+        parts.append(pd.DataFrame({"doc": tokens.index.to_numpy(), "term": tokens.to_numpy(), "w": weight}))
+    postings = pd.concat(parts, ignore_index=True)
+
+    if stemming:
+        # Stem each distinct token once rather than every occurrence
+        unique = postings["term"].unique()
+        postings["term"] = postings["term"].map(dict(zip(unique, map(stem, unique))))
+
+    n = len(df)
+    doc_len = np.bincount(postings["doc"].to_numpy(), weights=postings["w"].to_numpy(), minlength=n)
+
+    # Sum the weights per (term, doc) on integer keys, sorted by term then doc
+    codes, terms = pd.factorize(postings["term"], sort=True)
+    keys, inverse = np.unique(codes.astype("int64") * n + postings["doc"].to_numpy(), return_inverse=True)
+    tf = np.bincount(inverse, weights=postings["w"].to_numpy())
+
+    return SearchIndex(
+        terms=np.asarray(terms, dtype=str),
+        docs=(keys % n).astype("int32"),
+        tf=tf.astype("float32"),
+        offsets=np.concatenate([[0], np.cumsum(np.bincount(keys // n, minlength=len(terms)))]),
+        doc_len=doc_len.astype("float32"),
+        stemming=stemming,
+    )
+
+
+def cached_search_index(source: str, df: pd.DataFrame, data_version: int = 0) -> SearchIndex:
+    # Persisted next to the CSV and rebuilt when it changes. Documents are row
+    # positions in `df`, so the version of the code that prepared it is part of the key
+    target = cache_path(source, "netflix-search", f"{INDEX_VERSION}.{data_version}", ext=".npz")
+    if os.path.exists(target):
+        return SearchIndex.load(target)
+    index = build_search_index(df)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    remove_stale(target, "netflix-search", ext=".npz")
+    index.save(target)
+    return index
+
+
+def benchmark(df: pd.DataFrame, queries: list[str], repeat: int = 20) -> dict[str, float]:
+    start = time.perf_counter()
+    index = build_search_index(df)
+    build = time.perf_counter() - start
+
+    latencies = []
+    for _ in range(repeat):
+        for query in queries:
+            start = time.perf_counter()
+            index.search(query)
+            latencies.append(time.perf_counter() - start)
+
+    return {
+        "build_ms": build * 1000,
+        "query_mean_ms": float(np.mean(latencies)) * 1000,
+        "query_p95_ms": float(np.percentile(latencies, 95)) * 1000,
+        "index_mb": index.nbytes / 1024 ** 2,
+    }
+
+
+if __name__ == "__main__":
+    from andrii.common import load_data
+
+    queries = sys.argv[1:] or ["detective", "true story war", "Shah Rukh Khan", "christmas romance", "space"]
+    for name, value in benchmark(load_data(), queries).items():
+        print(f"{name}: {value:.2f}")
@@ -1,7 +1,19 @@
 import streamlit as st
+from streamlit.logger import get_logger
+
+from common.trace import debug_panel, rerun
+from common.warmup import warmup
 
 st.set_page_config(layout="wide")
 
+# Give the app's loggers streamlit's console handler and level, otherwise their
+# INFO lines (warm-up timings, ingest and compaction reports) are never shown
+for package in ("common", "queries", "andrii", "artyom", "edgars", "georgy"):
+    get_logger(package)
+
+# Loads every dataset in the background, once per server process
+warmup.start()
+
 pages = {
     "Andrii": [
         st.Page("andrii/overview.py",
@@ -45,4 +57,11 @@ pages = {
 }
 
 pg = st.navigation(pages)
-pg.run()
\ No newline at end of file
+
+# Spans of this rerun, shown in the sidebar when TRACE_RERUNS=1
+trace = None
+try:
+    with rerun(pg.title) as trace:
+        pg.run()
+finally:
+    debug_panel(trace)
\ No newline at end of file
@@ -0,0 +1,160 @@
+import os
+from dataclasses import dataclass
+from glob import glob
+
+import numpy as np
+import pandas as pd
+
+from common.columnar import cached_frame, mapped_frame
+from common.filters import FilterIndex
+from common.profile import Profile, load_profile as _load_profile, write_profile as _write_profile
+from common.schema import compact
+from common.sketch import SketchTable
+from common.store import shared
+from common.trace import traced
+
+DATA_DIR = "data/artyom"
+
+# Bump when parse_city or preprocess_dataset change so cached city frames get rebuilt
+CITY_VERSION = 1
+
+# Filter keys and measures summarized in the dataset profile
+PROFILE_GROUPS = [["city"], ["city", "room_type"]]
+PROFILE_MEASURES = ["realSum", "guest_satisfaction_overall"]
+
+
+def city_files() -> list[str]:
+    return sorted(glob(os.path.join(DATA_DIR, "*.csv")))
+
+
+def city_name(path: str) -> str:
+    return os.path.splitext(os.path.basename(path))[0].capitalize()
+
+
+def preprocess_dataset(df: pd.DataFrame) -> pd.DataFrame:
+    return df.drop(columns=[
+        "Unnamed: 0",
+        "room_shared",
+        "room_private",
+        "person_capacity",
+        "host_is_superhost",
+        "multi",
+        "biz",
+        "bedrooms",
+        "dist",
+        "metro_dist",
+        "attr_index",
+        "attr_index_norm",
+        "rest_index",
+        "rest_index_norm",
+    ])
+
+
+def parse_city(path: str) -> pd.DataFrame:
+    df = preprocess_dataset(compact(pd.read_csv(path), "airbnb", city_name(path)))
+    df.insert(0, "city", city_name(path))
+    return df
+
+
+def city_cache_name(path: str) -> str:
+    # One cache per city file, named after it so stale versions of other cities are kept apart
+    return f"{os.path.splitext(os.path.basename(path))[0]}.city"
+
+
+def read_city(path: str) -> pd.DataFrame:
+    # Parsed once per version of the file, afterwards served from Parquet
+    return cached_frame(path, city_cache_name(path), lambda: parse_city(path), version=CITY_VERSION)
+
+
+@dataclass
+class Cities:
+    """All city listings in one frame, sorted by city so that every city is a
+    contiguous partition of it."""
+
+    df: pd.DataFrame
+    partitions: dict[str, slice]
+    index: FilterIndex
+
+    @property
+    def names(self) -> list[str]:
+        return list(self.partitions)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.df.memory_usage(deep=True).sum()) + self.index.nbytes
+
+    def city(self, name: str) -> pd.DataFrame:
+        return self.df.iloc[self.partitions[name]]
+
+    def select(self, cities: list[str], room_type: str | None = None) -> pd.DataFrame:
+        if room_type is None and len(cities) == 1:
+            return self.city(cities[0])
+        isin = {"city": cities}
+        if room_type is not None:
+            isin["room_type"] = [room_type]
+        return self.index.select(isin=isin)
+
+
+def concat_cities(paths: list[str]) -> pd.DataFrame:
+    # Every city file in one frame, in city order
+    frames = [read_city(path) for path in sorted(paths, key=city_name)]
+    df = pd.concat(frames, ignore_index=True)
+    df["city"] = df["city"].astype("category")
+
+    room_types = sorted(set().union(*(frame["room_type"].dropna().unique() for frame in frames)))
+    df["room_type"] = pd.Categorical(df["room_type"].astype(object), categories=room_types)
+    return df
+
+
+def partition_cities(df: pd.DataFrame) -> dict[str, slice]:
+    # The frame is in city order, so every city is one run of equal codes
+    codes = df["city"].cat.codes.to_numpy()
+    bounds = np.flatnonzero(np.diff(codes)) + 1
+    starts, ends = np.r_[0, bounds], np.r_[bounds, len(codes)]
+    categories = df["city"].cat.categories
+    return {categories[codes[start]]: slice(int(start), int(end)) for start, end in zip(starts, ends) if end > start}
+
+
+@traced
+def read_cities(paths: list[str]) -> Cities:
+    # Mapped from one Arrow file shared by every process on the host
+    df = mapped_frame(paths, "cities", lambda: concat_cities(paths), version=CITY_VERSION)
+    return Cities(df, partition_cities(df), FilterIndex(df, ["city", "room_type"]))
+
+
+def load_cities() -> Cities:
+    # One combined frame for every city file, rebuilt when any file changes
+    paths = city_files()
+    return shared("artyom/cities", paths, lambda: read_cities(paths))
+
+
+def write_profile() -> str:
+    return _write_profile(city_files(), "airbnb", load_cities().df, PROFILE_GROUPS, PROFILE_MEASURES)
+
+
+def load_profile() -> Profile | None:
+    return _load_profile(city_files(), "airbnb")
+
+
+def load_price_sketches() -> SketchTable:
+    # Price distribution per (city, room type), merged for any selection
+    paths = city_files()
+    return shared(
+        "artyom/price-sketches",
+        paths,
+        lambda: SketchTable(load_cities().df, ["city", "room_type"], ["realSum"]),
+    )
+
+
+def price_stats(cities: list[str], room_type: str | None = None) -> dict:
+    """realSum statistics of the selection, from the profile when it covers
+    a single city and from the price sketches otherwise."""
+    profile = load_profile()
+    if profile is not None and len(cities) == 1:
+        if room_type is None:
+            stats = profile.group(["city"], (cities[0],), "realSum")
+        else:
+            stats = profile.group(["city", "room_type"], (cities[0], room_type), "realSum")
+        if stats:
+            return stats
+    return load_price_sketches().summary("realSum", city=cities, room_type=room_type)
@@ -1,84 +1,79 @@
-import numpy as np
 import streamlit as st
 import pandas as pd
-from glob import glob
+
+from common.trace import payload, span
+from common.warmup import placeholder
+from queries import airbnb
+from queries.airbnb import AirbnbFilter
 
 currency = "€"
 
 
-def load_dataset() -> pd.DataFrame:
-    dataset_filename = st.selectbox(
-        "Dataset", 
-        glob("data/artyom/*.csv"),
-        format_func=lambda x: x.split("/")[-1].rstrip(".csv").capitalize()
+def load_dataset() -> list[str]:
+    names = airbnb.cities()
+    return st.multiselect(
+        "Dataset",
+        names,
+        default=names[:1],
     )
-    return pd.read_csv(dataset_filename)
 
 
 def tab_view(df: pd.DataFrame):
     with st.expander("Table View", expanded=True):
-        st.write(df)
-
-def preprocess_dataset(df: pd.DataFrame) -> None:
-    df.drop(columns=[
-        "Unnamed: 0",
-        "room_shared",
-        "room_private",
-        "person_capacity",
-        "host_is_superhost",
-        "multi",
-        "biz",
-        "bedrooms",
-        "dist",
-        "metro_dist",
-        "attr_index",
-        "attr_index_norm",
-        "rest_index",
-        "rest_index_norm",
-    ], inplace=True)
-
-
-
-
-def visualize_dataset(df: pd.DataFrame) -> None:
+        with span("st.write", **payload(df)):
+            st.write(df)
+
+
+def compare_cities(spec: AirbnbFilter) -> None:
+    # Side by side price statistics for every selected city
+    comparison = airbnb.aggregate(spec)
+    comparison.columns = ["Median", "Max", "Min", "Average"]
+    st.dataframe(comparison.style.format(f"{currency}{{:.2f}}"))
+
+
+def visualize_dataset(selected_cities: list[str]) -> None:
     input_metric_cols = st.columns(2)
-    
-    size_metric_col = input_metric_cols[0].selectbox("Visualize as size", ["realSum", "guest_satisfaction_overall"])
-    color_metric_col = input_metric_cols[1].selectbox("Visualize as color", ["realSum", "guest_satisfaction_overall"])
-    
-    room_type_filter = st.selectbox("Filter Room Type", ["All"] + df["room_type"].unique().tolist())
-    if room_type_filter and room_type_filter != "All":
-        df = df[df["room_type"] == room_type_filter]
-    
-    
-    df["color_metric"] = df[color_metric_col].apply(
-        lambda x: (
-            int(255 / df[color_metric_col].max() * x),  # Red
-            100,                                        # Green
-            150,                                        # Blue
-            255                                         # Transparency
+
+    size_metric_col = input_metric_cols[0].selectbox("Visualize as size", airbnb.METRICS)
+    color_metric_col = input_metric_cols[1].selectbox("Visualize as color", airbnb.METRICS)
+
+    room_type_filter = st.selectbox("Filter Room Type", ["All"] + airbnb.room_types())
+    room_type = room_type_filter if room_type_filter and room_type_filter != "All" else None
+    spec = AirbnbFilter(selected_cities, room_type)
+
+    if len(selected_cities) > 1:
+        compare_cities(spec)
+    else:
+        stats = airbnb.aggregate(spec).iloc[0]
+        price_metrics_cols = st.columns(4)
+
+        price_metrics_cols[0].metric("Median", f"{currency}{stats['median']:.2f}")
+        price_metrics_cols[1].metric("Max", f"{currency}{stats['max']:.2f}")
+        price_metrics_cols[2].metric("Min", f"{currency}{stats['min']:.2f}")
+        price_metrics_cols[3].metric("Average", f"{currency}{stats['mean']:.2f}")
+
+    layer = airbnb.map_layer(spec, size=size_metric_col, color=color_metric_col)
+
+    with span("st.map", **payload(layer.points)):
+        st.map(
+            layer.points,
+            size=size_metric_col if layer.size is None else layer.size,
+            color="color_metric",
+            zoom=layer.zoom,
         )
-    )
-    
-    price_metrics_cols = st.columns(4)
-    
-    price_metrics_cols[0].metric("Median", f"{currency}{df['realSum'].median():.2f}")
-    price_metrics_cols[1].metric("Max", f"{currency}{df['realSum'].max():.2f}")
-    price_metrics_cols[2].metric("Min", f"{currency}{df['realSum'].min():.2f}")
-    price_metrics_cols[3].metric("Average", f"{currency}{df['realSum'].mean():.2f}")
-    
-    st.map(
-        df.rename(columns={"lng": "lon", "lat": "lat"}),
-        size=size_metric_col,
-        color="color_metric",
-    )
-    
-    
-df = load_dataset()
+
+
+placeholder("airbnb", "Airbnb listings")
+
+selected_cities = load_dataset()
+if not selected_cities:
+    st.info("Select at least one city.")
+    st.stop()
+
+df = airbnb.filter(AirbnbFilter(selected_cities))
 try:
-    preprocess_dataset(df)
-    visualize_dataset(df)
+    visualize_dataset(selected_cities)
 except Exception as e:
     raise(e)
 finally:
-    tab_view(df)
\ No newline at end of file
+    tab_view(df)
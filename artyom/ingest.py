@@ -0,0 +1,79 @@
+"""Parallel ingestion of the city CSVs.
+
+Every file is parsed, cleaned, dtype-compacted and written to its Parquet
+cache in a worker process, so rebuilding scales with cores rather than
+with the number of cities. Each cache depends only on its own file, so the
+output is the same whatever the number of workers.
+
+    python -m artyom.ingest                  # build missing caches, one worker per core
+    python -m artyom.ingest --workers 1 2 4  # rebuild all with each worker count and compare
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import repeat
+
+from artyom.common import CITY_VERSION, city_cache_name, city_files, read_city
+from common.columnar import cache_path
+
+
+@dataclass
+class IngestReport:
+    files: int
+    rows: int
+    workers: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / max(self.seconds, 1e-9)
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files / max(self.seconds, 1e-9)
+
+    def __str__(self) -> str:
+        return (
+            f"{self.workers:>3} workers: {self.files} files, {self.rows} rows in {self.seconds:.2f}s "
+            f"({self.rows_per_second:,.0f} rows/s, {self.files_per_second:.1f} files/s)"
+        )
+
+
+def ingest_file(path: str, force: bool = False) -> int:
+    # Runs in a worker process, returns the number of rows
+    if force:
+        target = cache_path(path, city_cache_name(path), CITY_VERSION)
+        if os.path.exists(target):
+            os.remove(target)
+    return len(read_city(path))
+
+
+def ingest(paths: list[str] | None = None, workers: int | None = None, force: bool = False) -> IngestReport:
+    """Write the Parquet cache of every city file, `force` rebuilding the
+    ones that already exist. `workers` defaults to one per core and is
+    capped at the number of files."""
+    paths = sorted(paths if paths is not None else city_files())
+    # No more workers than files, the report shows how many actually ran
+    workers = min(workers or os.cpu_count() or 1, max(len(paths), 1))
+
+    start = time.perf_counter()
+    if workers == 1:
+        rows = [ingest_file(path, force) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            rows = list(pool.map(ingest_file, paths, repeat(force)))
+    return IngestReport(len(paths), sum(rows), workers, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the Parquet cache of every city CSV in parallel.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[os.cpu_count() or 1])
+    parser.add_argument("--force", action="store_true", help="rebuild existing caches")
+    args = parser.parse_args()
+
+    # Comparing worker counts only makes sense when every run does the full work
+    force = args.force or len(args.workers) > 1
+    for workers in args.workers:
+        print(ingest(workers=workers, force=force))
@@ -26,16 +26,15 @@ if room_type_filter and room_type_filter != "All":
 A new column, `color_metric`, is added to the dataset. 
 
 This column is calculated based on the selected `color_metric_col` (e.g., `realSum` or `guest_satisfaction_overall`).
-The color_metric column is created by applying a lambda function to scale the values of the selected column into RGBA color values:
+The color_metric column is created in one vectorized pass with the shared `color_column` helper, which scales the red channel
+by the selected column relative to its maximum and encodes the resulting RGBA values as hex strings:
 ```python
-df["color_metric"] = df[color_metric_col].apply(
-    lambda x: (
-        int(255 / df[color_metric_col].max() * x),  # Red
-        100,                                        # Green
-        150,                                        # Blue
-        255                                         # Transparency
-    )
-)
+df = df.assign(color_metric=color_column(
+    df[color_metric_col],
+    low=(0, 100, 150, 255),
+    high=(255, 100, 150, 255),
+    method="max",
+))
 ```
 
 #### Renaming Columns for Mapping:
@@ -0,0 +1,299 @@
+"""Headless benchmark of every page's data path.
+
+Run from the repository root with
+
+    python -m common.bench --scales 1 10 100 --output bench.json
+
+For every scale, synthetic datasets (see common.synthetic) are written to
+a temporary directory and each page's stages run there in order against a
+cold dataset store: load, preprocess or index, filter, and render prep.
+A final `rerun` stage executes the page script itself with `streamlit`
+replaced by a stub, as a warm rerun. Wall time, peak and retained traced
+memory and allocated blocks are reported per stage as JSON. Tracing slows
+everything down, so pass --no-trace for wall times alone.
+"""
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import runpy
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+from collections import Counter
+from typing import Any, Callable
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCALES = [1, 10, 100]
+
+# Widget values a rerun uses instead of the widgets' defaults, per page and label
+PAGE_INPUTS = {
+    "andrii/exploration.py": {"Search titles, descriptions, cast and directors": "love"},
+    "edgars/exploration.py": {"Show data table:": True},
+}
+
+
+class StopPage(Exception):
+    pass
+
+
+class StubStreamlit(types.ModuleType):
+    """Stands in for the streamlit module while a page script runs.
+
+    Widgets return `inputs[label]` or the default a new session would see,
+    layout calls return the stub itself, and every other call is counted
+    and ignored. Messages passed to st.error are kept in `errors`.
+    """
+
+    def __init__(self, inputs: dict[str, Any] | None = None):
+        super().__init__("streamlit")
+        self.inputs = inputs or {}
+        self.calls = Counter()
+        self.errors = []
+        self.sidebar = self
+
+    def _widget(self, name: str, label: str, default: Any) -> Any:
+        self.calls[name] += 1
+        return self.inputs.get(label, default)
+
+    def selectbox(self, label, options, index=0, **kwargs):
+        options = list(options)
+        return self._widget("selectbox", label, options[index] if options and index is not None else None)
+
+    def radio(self, label, options, index=0, **kwargs):
+        return self.selectbox(label, options, index)
+
+    def multiselect(self, label, options, default=None, **kwargs):
+        return self._widget("multiselect", label, list(default) if default is not None else [])
+
+    def slider(self, label, min_value=None, max_value=None, value=None, **kwargs):
+        return self._widget("slider", label, value if value is not None else min_value)
+
+    def checkbox(self, label, value=False, **kwargs):
+        return self._widget("checkbox", label, value)
+
+    def text_input(self, label, value="", **kwargs):
+        return self._widget("text_input", label, value)
+
+    def columns(self, spec, **kwargs):
+        return [self] * (spec if isinstance(spec, int) else len(spec))
+
+    def tabs(self, labels, **kwargs):
+        return [self] * len(labels)
+
+    def error(self, body, **kwargs):
+        self.errors.append(str(body))
+
+    def stop(self):
+        raise StopPage
+
+    def cache_data(self, func=None, **kwargs):
+        return func if callable(func) else (lambda f: f)
+
+    cache_resource = cache_data
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(name)
+
+        def call(*args, **kwargs):
+            self.calls[name] += 1
+            return self
+
+        return call
+
+
+def run_page(script: str, inputs: dict[str, Any] | None = None) -> StubStreamlit:
+    stub = StubStreamlit(inputs)
+    real = sys.modules.get("streamlit")
+    sys.modules["streamlit"] = stub
+    try:
+        runpy.run_path(os.path.join(REPO, script), run_name="__main__")
+    except StopPage:
+        pass
+    finally:
+        if real is None:
+            del sys.modules["streamlit"]
+        else:
+            sys.modules["streamlit"] = real
+    if stub.errors:
+        raise RuntimeError("; ".join(stub.errors))
+    return stub
+
+
+def measure(fn: Callable[[], Any], trace: bool = True) -> dict:
+    """Wall time of `fn`, and when tracing, its peak and retained memory
+    above the starting point and the number of blocks it left allocated."""
+    gc.collect()
+    if trace:
+        tracemalloc.reset_peak()
+        before_bytes = tracemalloc.get_traced_memory()[0]
+        before_blocks = sys.getallocatedblocks()
+
+    start = time.perf_counter()
+    error = None
+    try:
+        fn()
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    result = {"seconds": time.perf_counter() - start}
+
+    if trace:
+        current, peak = tracemalloc.get_traced_memory()
+        result["peak_bytes"] = peak - before_bytes
+        result["retained_bytes"] = current - before_bytes
+        # Interpreter-allocated blocks still alive, e.g. Python objects
+        result["allocated_blocks"] = sys.getallocatedblocks() - before_blocks
+    if error:
+        result["error"] = error
+    return result
+
+
+def _georgy() -> dict[str, Callable]:
+    from queries import housing
+    from queries.housing import HousingFilter
+
+    specs = [HousingFilter(state, rent) for state in housing.STATES for rent in ["Total rent", "Base rent"]]
+    return {
+        "load": housing.load,
+        "preprocess": housing.prepared,
+        "filter": lambda: [(housing.filter(spec), housing.aggregate(spec)) for spec in specs],
+        "render": lambda: [housing.map_layer(spec) for spec in specs[::2]],
+    }
+
+
+def _artyom() -> dict[str, Callable]:
+    from queries import airbnb
+    from queries.airbnb import AirbnbFilter
+
+    def specs():
+        return [AirbnbFilter(airbnb.cities(), room_type) for room_type in [None] + airbnb.room_types()]
+
+    return {
+        "load": airbnb.load,
+        "filter": lambda: [(airbnb.filter(spec), airbnb.aggregate(spec)) for spec in specs()],
+        "render": lambda: [airbnb.map_layer(spec, "realSum", "realSum") for spec in specs()],
+    }
+
+
+def _edgars() -> dict[str, Callable]:
+    from queries import border_crossings
+    from queries.border_crossings import CrossingsFilter
+
+    def spec():
+        return CrossingsFilter(["Pedestrians", "Trucks"], border_crossings.categories("Border"), border_crossings.year_range())
+
+    return {
+        "load": border_crossings.load,
+        "index": border_crossings.year_range,
+        "filter": lambda: border_crossings.filter(spec()),
+        "render": lambda: (border_crossings.aggregate(spec()), border_crossings.top_ports(spec())),
+    }
+
+
+def _andrii() -> dict[str, Callable]:
+    from queries import netflix
+    from queries.netflix import TitlesFilter
+
+    def spec():
+        return TitlesFilter(country=netflix.facet_values("country")[:1])
+
+    return {
+        "load": netflix.load,
+        "index": lambda: (netflix.filter(spec()), netflix.search("love")),
+        "filter": lambda: netflix.filter(spec()),
+        "render": lambda: (
+            [netflix.aggregate(TitlesFilter(), column) for column in ["type", "country", "release_year"]],
+            netflix.country_map(),
+        ),
+    }
+
+
+PAGES = {
+    "georgy/exploration.py": _georgy,
+    "artyom/exploration.py": _artyom,
+    "edgars/exploration.py": _edgars,
+    "andrii/exploration.py": _andrii,
+}
+
+
+def run_scale(scale: int, pages: list[str], trace: bool = True) -> tuple[dict[str, int], list[dict]]:
+    from common.store import store
+    from common.synthetic import write_datasets
+
+    results = []
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix=f"bench-{scale}x-") as root:
+        rows = write_datasets(root, scale, repo=REPO)
+        os.chdir(root)
+        if trace:
+            tracemalloc.start()
+        try:
+            for page in pages:
+                store.clear()
+                stages = {**PAGES[page](), "rerun": lambda: run_page(page, PAGE_INPUTS.get(page))}
+                for stage, fn in stages.items():
+                    result = measure(fn, trace)
+                    results.append({"page": page, "scale": scale, "stage": stage, **result})
+                    # Later stages build on this one
+                    if "error" in result and stage != "rerun":
+                        break
+        finally:
+            tracemalloc.stop()
+            os.chdir(cwd)
+    return rows, results
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=REPO, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(scales: list[int], pages: list[str], trace: bool = True) -> dict:
+    rows, results = {}, []
+    for scale in scales:
+        rows[scale], records = run_scale(scale, pages, trace)
+        results += records
+    return {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "traced": trace,
+            "rows": rows,
+        },
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=SCALES)
+    parser.add_argument("--pages", nargs="+", choices=list(PAGES), default=list(PAGES))
+    parser.add_argument("--no-trace", action="store_true", help="wall times only")
+    parser.add_argument("--output", help="JSON file to write, stdout by default")
+    args = parser.parse_args()
+
+    sys.path.insert(0, REPO)
+    report = run(args.scales, args.pages, trace=not args.no_trace)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
@@ -0,0 +1,67 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Layers with more points than this are sent to the browser as grid cells
+MAX_RAW_POINTS = int(os.environ.get("MAP_MAX_RAW_POINTS", "5000"))
+
+# Grid cells across one 256 px map tile at the current zoom
+CELLS_PER_TILE = 64
+
+METERS_PER_DEGREE = 111_320
+
+
+def fit_zoom(df: pd.DataFrame, lat: str = "lat", lon: str = "lon", max_zoom: float = 14) -> float:
+    # Roughly the zoom level at which the map shows all points
+    if df.empty:
+        return 1
+    span = max(np.ptp(df[lat].to_numpy()), np.ptp(df[lon].to_numpy()), 1e-6)
+    return float(np.clip(np.log2(360 / span), 1, max_zoom))
+
+
+def cell_size(zoom: float) -> float:
+    # In degrees, halves with every zoom level like the map tiles do
+    return 360 / 2 ** zoom / CELLS_PER_TILE
+
+
+def cell_radius(zoom: float) -> float:
+    # In meters, for sizing cell markers
+    return cell_size(zoom) * METERS_PER_DEGREE / 2
+
+
+def bin_points(
+    df: pd.DataFrame,
+    zoom: float,
+    lat: str = "lat",
+    lon: str = "lon",
+    mean: list[str] = (),
+    sum: list[str] = (),
+    first: list[str] = (),
+    threshold: int = MAX_RAW_POINTS,
+) -> pd.DataFrame:
+    """Aggregate points into a lat/lon grid sized for `zoom`.
+
+    Each cell is placed at the centroid of its points and carries their
+    number as `points`, the mean of the `mean` columns, the total of the
+    `sum` columns and the first value of the `first` columns (e.g. a
+    representative colour). Layers of at most `threshold` points are
+    returned unchanged.
+    """
+    if len(df) <= threshold:
+        return df
+
+    size = cell_size(zoom)
+    cells = df.groupby(
+        [np.floor(df[lat].to_numpy() / size), np.floor(df[lon].to_numpy() / size)],
+        sort=False,
+    )
+    aggregations = {
+        lat: (lat, "mean"),
+        lon: (lon, "mean"),
+        "points": (lat, "size"),
+        **{col: (col, "mean") for col in mean},
+        **{col: (col, "sum") for col in sum},
+        **{col: (col, "first") for col in first},
+    }
+    return cells.agg(**aggregations).reset_index(drop=True)
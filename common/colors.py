@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+NORMALIZATIONS = ("max", "minmax", "log", "iqr", "quantile")
+
+# Two-character hex code of every byte value, used to build colour strings
+_HEX = np.array([f"{i:02x}" for i in range(256)])
+
+
+def normalize(values: pd.Series | np.ndarray, method: str = "minmax") -> np.ndarray:
+    """Scale `values` into [0, 1] using one of `NORMALIZATIONS`.
+
+    `max` divides by the maximum, `log` applies log(x + 1) before min-max
+    scaling, `iqr` clips outliers to 1.5 IQR before min-max scaling and
+    `quantile` maps every value to its percentile rank.
+    """
+    x = np.asarray(values, dtype="float64")
+
+    if method == "max":
+        top = np.nanmax(x) if x.size else 0
+        return x / top if top else np.zeros_like(x)
+    if method == "quantile":
+        return pd.Series(x).rank(pct=True).to_numpy()
+    if method == "log":
+        x = np.log(x + 1)
+    elif method == "iqr":
+        perc25, perc75 = np.nanquantile(x, [0.25, 0.75]) if x.size else (0, 0)
+        iqr = perc75 - perc25
+        x = np.clip(x, perc25 - 1.5 * iqr, perc75 + 1.5 * iqr)
+    elif method != "minmax":
+        raise ValueError(f"Unknown normalization {method!r}, expected one of {NORMALIZATIONS}")
+
+    if not x.size:
+        return x
+    min_val, max_val = np.nanmin(x), np.nanmax(x)
+    if max_val == min_val:
+        return np.zeros_like(x)
+    return (x - min_val) / (max_val - min_val)
+
+
+def iqr_bounds(values: pd.Series | np.ndarray) -> tuple[float, float]:
+    # The range normalize(values, "iqr") maps to [0, 1], to put other values on the same scale
+    x = np.asarray(values, dtype="float64")
+    x = x[np.isfinite(x)]
+    if not x.size:
+        return 0.0, 0.0
+    perc25, perc75 = np.quantile(x, [0.25, 0.75])
+    iqr = perc75 - perc25
+    return float(max(x.min(), perc25 - 1.5 * iqr)), float(min(x.max(), perc75 + 1.5 * iqr))
+
+
+def rgba(
+    values: pd.Series | np.ndarray,
+    low: tuple[int, int, int, int],
+    high: tuple[int, int, int, int],
+    method: str = "minmax",
+    bounds: tuple[float, float] | None = None,
+    missing: tuple[int, int, int, int] | None = None,
+) -> np.ndarray:
+    """Interpolate between the `low` and `high` RGBA colours, returning an
+    (n, 4) uint8 array. Values are scaled with `method`, or linearly from
+    fixed `bounds` (clipped) when given. Missing values get the `missing`
+    colour, or the `low` one without it."""
+    if bounds is None:
+        t = normalize(values, method)
+    else:
+        x = np.asarray(values, dtype="float64")
+        lo, hi = bounds
+        t = (x - lo) / (hi - lo) if hi > lo else np.where(np.isnan(x), np.nan, 0.0)
+    unknown = np.isnan(t)
+    t = np.nan_to_num(t, nan=0.0).clip(0, 1)
+    low_arr = np.asarray(low, dtype="float64")
+    high_arr = np.asarray(high, dtype="float64")
+    colors = (low_arr + t[:, None] * (high_arr - low_arr)).astype("uint8")
+    if missing is not None:
+        colors[unknown] = missing
+    return colors
+
+
+def to_hex(colors: np.ndarray) -> np.ndarray:
+    # "#rrggbbaa" strings, as accepted by st.map
+    hex_parts = _HEX[colors]
+    out = np.char.add("#", hex_parts[:, 0])
+    for channel in range(1, colors.shape[1]):
+        out = np.char.add(out, hex_parts[:, channel])
+    return out.astype(object)
+
+
+def color_column(
+    values: pd.Series,
+    low: tuple[int, int, int, int],
+    high: tuple[int, int, int, int],
+    method: str = "minmax",
+    bounds: tuple[float, float] | None = None,
+    missing: tuple[int, int, int, int] | None = None,
+) -> pd.Series:
+    return pd.Series(to_hex(rgba(values, low, high, method, bounds, missing)), index=values.index)
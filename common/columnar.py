@@ -0,0 +1,249 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from glob import glob
+from typing import Callable, Iterable
+
+import numpy as np
+import pandas as pd
+
+CACHE_DIRNAME = ".cache"
+
+# pandas dtypes with a separate mask, stored as plain Arrow columns with nulls
+MASKED_DTYPES = ("Int", "UInt", "Float", "boolean")
+
+_hashes: dict[tuple[str, int, int], str] = {}
+
+
+def file_hash(path: str) -> str:
+    # Hashing a large CSV is not free, so remember it per (path, size, mtime)
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if key not in _hashes:
+        digest = hashlib.sha1()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        _hashes[key] = digest.hexdigest()[:16]
+    return _hashes[key]
+
+
+def sources_hash(sources: list[str]) -> str:
+    if len(sources) == 1:
+        return file_hash(sources[0])
+    return hashlib.sha1("-".join(file_hash(path) for path in sources).encode()).hexdigest()[:16]
+
+
+def cache_path(source: str | list[str], name: str, version: int | str = 0, ext: str = ".parquet") -> str:
+    # Next to the (first) source, keyed by the hash of every source
+    sources = [source] if isinstance(source, str) else source
+    cache_dir = os.path.join(os.path.dirname(sources[0]), CACHE_DIRNAME)
+    return os.path.join(cache_dir, f"{name}-{sources_hash(sources)}-v{version}{ext}")
+
+
+def remove_stale(target: str, name: str, ext: str = ".parquet") -> None:
+    # Drop files built from older versions of the source
+    for stale in glob(os.path.join(os.path.dirname(target), f"{name}-*{ext}")):
+        if stale != target:
+            try:
+                os.remove(stale)
+            except OSError:  # still mapped by another process on Windows
+                pass
+
+
+def temp_path(target: str, suffix: str = ".tmp") -> str:
+    # A new file next to `target`, unique to this writer
+    fd, tmp = tempfile.mkstemp(prefix=os.path.basename(target) + ".", suffix=suffix, dir=os.path.dirname(target))
+    os.close(fd)
+    return tmp
+
+
+def replace(tmp: str, target: str) -> None:
+    """Move the finished `tmp` file over `target`. Every process writes its
+    own temporary file, so concurrent builds of the same target never write
+    to one file, and whichever finishes last wins with identical content."""
+    try:
+        os.replace(tmp, target)
+    except OSError:
+        # e.g. Windows refusing to replace a file another process has mapped
+        if not os.path.exists(target):
+            raise
+        os.remove(tmp)
+
+
+def cached_frame(
+    source: str,
+    name: str,
+    build: Callable[[], pd.DataFrame],
+    version: int = 0,
+) -> pd.DataFrame:
+    """Load `name` derived from `source` from its Parquet cache, rebuilding it
+    with `build` when the source file or the `version` of `build` changes."""
+    target = cache_path(source, name, version)
+    if os.path.exists(target):
+        return pd.read_parquet(target)
+
+    df = build()
+
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    remove_stale(target, name)
+    tmp = temp_path(target)
+    df.to_parquet(tmp)
+    replace(tmp, target)
+
+    return df
+
+
+def _to_table(df: pd.DataFrame):
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df)
+    # NaN is kept as a float value rather than a null, so these columns read back without a copy
+    for i, name in enumerate(table.column_names):
+        if name in df.columns and df[name].dtype.kind == "f":
+            table = table.set_column(i, table.field(i), pa.array(df[name].to_numpy()))
+    return table
+
+
+def write_arrow(df: pd.DataFrame, target: str) -> None:
+    import pyarrow as pa
+
+    table = _to_table(df)
+    tmp = temp_path(target)
+    with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    replace(tmp, target)
+
+
+# Rows remapped at a time when the spooled category codes are sorted
+REMAP_BLOCK = 1 << 20
+
+
+class _Spool:
+    """One column of `write_arrow_chunks`, appended to a file chunk by chunk.
+    Categoricals are stored as int32 codes into the categories in order of
+    first appearance, and sorted once every chunk is in."""
+
+    def __init__(self, path: str, series: pd.Series):
+        self.path = path
+        self.categories: dict | None = {} if isinstance(series.dtype, pd.CategoricalDtype) else None
+        self.dtype = np.dtype("int32") if self.categories is not None else series.dtype
+        if self.dtype.kind not in "iufM":
+            raise TypeError(f"Cannot spool {series.name} of type {series.dtype}")
+
+    def append(self, series: pd.Series) -> None:
+        if self.categories is not None:
+            # -1 (missing) picks the trailing -1 of the lookup table
+            lookup = [self.categories.setdefault(value, len(self.categories)) for value in series.cat.categories]
+            values = np.array(lookup + [-1], dtype="int32")[series.cat.codes.to_numpy()]
+        else:
+            values = series.to_numpy(self.dtype)
+        with open(self.path, "ab") as f:
+            values.tofile(f)
+
+    def to_arrow(self, rows: int):
+        import pyarrow as pa
+
+        data = np.memmap(self.path, dtype=self.dtype, mode="r", shape=(rows,)) if rows else np.empty(0, self.dtype)
+        if self.categories is None:
+            return pa.array(data)
+
+        values = np.array(list(self.categories), dtype=object)
+        order = np.argsort(values, kind="stable")
+        rank = np.empty(len(order) + 1, dtype="int32")
+        rank[order] = np.arange(len(order))
+        rank[-1] = -1
+
+        index_type = next(t for t in ("int8", "int16", "int32") if len(order) <= np.iinfo(t).max)
+        codes = np.memmap(self.path + ".sorted", dtype=index_type, mode="w+", shape=(rows,)) if rows \
+            else np.empty(0, index_type)
+        for start in range(0, rows, REMAP_BLOCK):
+            codes[start:start + REMAP_BLOCK] = rank[data[start:start + REMAP_BLOCK]]
+
+        missing = codes < 0
+        indices = pa.array(codes, mask=missing) if missing.any() else pa.array(codes)
+        return pa.DictionaryArray.from_arrays(indices, pa.array(values[order]))
+
+
+def write_arrow_chunks(chunks: Iterable[pd.DataFrame], target: str) -> int:
+    """Write the concatenation of `chunks` to `target` as a single Arrow
+    record batch while holding about one chunk in memory, returning the
+    number of rows. Every column is spooled to a file next to `target`
+    first and memory-mapped for the final write, so the result maps back
+    contiguous, i.e. zero-copy. Numeric, datetime and categorical columns
+    only, with the categories of each column sorted."""
+    import pyarrow as pa
+
+    spool_dir = tempfile.mkdtemp(prefix=os.path.basename(target) + ".", suffix=".spool", dir=os.path.dirname(target))
+    try:
+        spools: dict[str, _Spool] = {}
+        rows = 0
+        for chunk in chunks:
+            for i, (name, series) in enumerate(chunk.items()):
+                if name not in spools:
+                    spools[name] = _Spool(os.path.join(spool_dir, str(i)), series)
+                spools[name].append(series)
+            rows += len(chunk)
+
+        table = pa.table({name: spool.to_arrow(rows) for name, spool in spools.items()})
+        tmp = temp_path(target)
+        with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        del table
+        replace(tmp, target)
+        return rows
+    finally:
+        shutil.rmtree(spool_dir, ignore_errors=True)
+
+
+def _string_dtype(arrow_type):
+    import pyarrow as pa
+
+    # Arrow-backed strings on every pandas version, the default `str` dtype from pandas 3 on
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return pd.StringDtype("pyarrow", na_value=np.nan)
+    return None
+
+
+def read_mapped(path: str) -> pd.DataFrame:
+    """Frame backed by a memory mapping of the Arrow IPC file at `path`.
+
+    Numeric, string and categorical columns are views of the mapping and
+    therefore read-only. Nullable integer and boolean columns come back as
+    Arrow-backed (e.g. int16[pyarrow]) instead of their masked pandas
+    dtypes, which would need copying. Only timestamps with missing values
+    and categorical dictionaries are copied onto the heap.
+    """
+    import pyarrow as pa
+
+    with pa.memory_map(path, "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+
+    columns = (table.schema.pandas_metadata or {}).get("columns", [])
+    masked = [c["field_name"] for c in columns if c["numpy_type"].startswith(MASKED_DTYPES)]
+    df = table.drop_columns(masked).to_pandas(split_blocks=True, types_mapper=_string_dtype)
+    for name in masked:
+        df[name] = pd.Series(pd.arrays.ArrowExtensionArray(table.column(name)), index=df.index)
+    return df[[name for name in table.column_names if name in df.columns]]
+
+
+def mapped_frame(
+    source: str | list[str],
+    name: str,
+    build: Callable[[], pd.DataFrame],
+    version: int = 0,
+) -> pd.DataFrame:
+    """Like `cached_frame`, but stored as an uncompressed Arrow IPC file and
+    memory-mapped, so every process on the host reading it shares one copy
+    of its columns in the OS page cache instead of holding its own on the
+    heap (see `read_mapped` for the few parts that are still copied)."""
+    target = cache_path(source, name, version, ".arrow")
+    if not os.path.exists(target):
+        df = build()
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        remove_stale(target, name, ".arrow")
+        write_arrow(df, target)
+
+    # Read back even right after building, so the builder shares the mapping too
+    return read_mapped(target)
@@ -0,0 +1,79 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable
+
+from common.trace import span
+
+DEFAULT_MAX_BYTES = int(os.environ.get("FIGURE_CACHE_MAX_MB", "64")) * 1024 ** 2
+
+
+class FigureCache:
+    """Process-wide LRU cache of built figures shared by every session.
+
+    Entries are the figures as parsed JSON dicts, keyed by chart name,
+    dataset version and filter spec key. A selection that any session has
+    already rendered is served without recomputing its aggregation or
+    building and serializing the plotly figure again. Entries are sized by
+    their JSON length and shared, so they must not be modified.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, str, str], tuple[dict, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, str, str], build: Callable[[], Any]) -> tuple[dict, int, bool]:
+        # The figure dict, its JSON size and whether it came from the cache
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return *entry, True
+            self.misses += 1
+
+        # Built outside the lock, two sessions missing at once both build it.
+        # The JSON round trip leaves plain dicts, lists and numbers, no numpy arrays
+        payload = build().to_json()
+        entry = (json.loads(payload), len(payload))
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = entry
+                self._bytes += entry[1]
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, size) = self._entries.popitem(last=False)
+                self._bytes -= size
+        return *entry, False
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "hits": self.hits, "misses": self.misses}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+figure_cache = FigureCache()
+
+
+def cached_figure(chart: str, spec, version: str, build: Callable[[], Any]) -> dict:
+    """Figure dict for st.plotly_chart, built by `build` (returning a plotly
+    figure) only the first time `chart` is drawn for `spec` at `version`.
+
+    st.plotly_chart still turns the dict back into a validated go.Figure
+    and serializes it for the browser on every call. That cost can't be
+    avoided through st.plotly_chart; the cache saves the aggregation,
+    px figure construction and JSON parsing."""
+    with span(f"figure {chart}") as s:
+        figure, size, hit = figure_cache.get((chart, version, spec.key()), build)
+        if s is not None:
+            s.attrs.update(hit=hit, bytes=size)
+    return figure
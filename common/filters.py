@@ -0,0 +1,89 @@
+import threading
+from collections import OrderedDict
+from typing import Hashable, Iterable
+
+import numpy as np
+import pandas as pd
+
+
+class FilterIndex:
+    """Bitmap index over the low-cardinality columns of a frame.
+
+    Every distinct value of an indexed column gets a packed bitmap of the
+    rows holding it, so a filter is an OR over the selected values of each
+    column followed by an AND across columns, on n / 8 bytes per bitmap
+    instead of comparing every row. Per-column results are memoized, so
+    changing one widget only rebuilds that column's bitmap.
+    """
+
+    def __init__(self, df: pd.DataFrame, columns: list[str], cache_size: int = 64):
+        self.df = df
+        self.rows = len(df)
+        self.categories: dict[str, np.ndarray] = {}
+        self._bitmaps: dict[str, np.ndarray] = {}
+        for column in columns:
+            codes, uniques = pd.factorize(df[column], sort=True)
+            self.categories[column] = np.asarray(uniques)
+            self._bitmaps[column] = np.stack(
+                [np.packbits(codes == code) for code in range(len(uniques))]
+            ) if len(uniques) else np.zeros((0, (self.rows + 7) // 8), dtype="uint8")
+
+        self._cache: OrderedDict[tuple, np.ndarray] = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self) -> int:
+        return sum(bitmaps.nbytes for bitmaps in self._bitmaps.values())
+
+    def _column_bitmap(self, column: str, key: Hashable, codes: np.ndarray) -> np.ndarray:
+        cache_key = (column, key)
+        with self._lock:
+            if cache_key in self._cache:
+                self._cache.move_to_end(cache_key)
+                return self._cache[cache_key]
+
+        bitmaps = self._bitmaps[column]
+        if len(codes):
+            bitmap = np.bitwise_or.reduce(bitmaps[codes], axis=0)
+        else:
+            bitmap = np.zeros(bitmaps.shape[1], dtype="uint8")
+
+        with self._lock:
+            self._cache[cache_key] = bitmap
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return bitmap
+
+    def isin(self, column: str, values: Iterable) -> np.ndarray:
+        values = frozenset(values)
+        categories = self.categories[column]
+        codes = np.flatnonzero(np.isin(categories, list(values)))
+        return self._column_bitmap(column, values, codes)
+
+    def between(self, column: str, low, high) -> np.ndarray:
+        # Categories are sorted, so an inclusive range is a contiguous slice of codes
+        categories = self.categories[column]
+        start = np.searchsorted(categories, low, side="left")
+        stop = np.searchsorted(categories, high, side="right")
+        return self._column_bitmap(column, ("between", low, high), np.arange(start, stop))
+
+    def positions(
+        self,
+        isin: dict[str, Iterable] | None = None,
+        between: dict[str, tuple] | None = None,
+    ) -> np.ndarray:
+        """Row positions matching every `isin` and (inclusive) `between` condition."""
+        bitmaps = [self.isin(column, values) for column, values in (isin or {}).items()]
+        bitmaps += [self.between(column, *bounds) for column, bounds in (between or {}).items()]
+        if not bitmaps:
+            return np.arange(self.rows)
+        mask = np.bitwise_and.reduce(bitmaps, axis=0) if len(bitmaps) > 1 else bitmaps[0]
+        return np.flatnonzero(np.unpackbits(mask, count=self.rows))
+
+    def select(
+        self,
+        isin: dict[str, Iterable] | None = None,
+        between: dict[str, tuple] | None = None,
+    ) -> pd.DataFrame:
+        return self.df.iloc[self.positions(isin, between)]
@@ -0,0 +1,74 @@
+"""Import-time report for every page registered in app.py.
+
+Run from the repository root with `python -m common.imports`. Each page's
+imports are timed in a fresh interpreter that has already imported
+streamlit, as the app server has, so the numbers are what a page adds on
+its first render.
+"""
+import ast
+import json
+import subprocess
+import sys
+
+APP_PATH = "app.py"
+
+_MEASURE = """
+import importlib, json, sys, time
+import streamlit
+times = {}
+for name in sys.argv[1:]:
+    start = time.perf_counter()
+    try:
+        importlib.import_module(name)
+    except ImportError:
+        times[name] = None
+        continue
+    times[name] = time.perf_counter() - start
+print(json.dumps(times))
+"""
+
+
+def page_scripts(app_path: str = APP_PATH) -> list[str]:
+    # The script path of every st.Page(...) call
+    tree = ast.parse(open(app_path, encoding="utf-8").read())
+    return [
+        node.args[0].value
+        for node in ast.walk(tree)
+        if isinstance(node, ast.Call)
+        and getattr(node.func, "attr", None) == "Page"
+        and node.args
+        and isinstance(node.args[0], ast.Constant)
+    ]
+
+
+def page_imports(script: str) -> list[str]:
+    # Absolute imports anywhere in the script, including deferred ones
+    tree = ast.parse(open(script, encoding="utf-8").read())
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.append(node.module)
+    return list(dict.fromkeys(n for n in names if n != "streamlit"))
+
+
+def measure(modules: list[str]) -> dict[str, float | None]:
+    # Seconds per module, None for modules that aren't installed
+    result = subprocess.run(
+        [sys.executable, "-c", _MEASURE, *modules],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout)
+
+
+def report(app_path: str = APP_PATH) -> dict[str, dict[str, float | None]]:
+    return {script: measure(page_imports(script)) for script in page_scripts(app_path)}
+
+
+if __name__ == "__main__":
+    for script, times in report().items():
+        print(f"{script}: {sum(t for t in times.values() if t) * 1000:.0f} ms")
+        for name, seconds in sorted(times.items(), key=lambda item: -(item[1] or 0)):
+            timing = "not installed" if seconds is None else f"{seconds * 1000:8.1f} ms"
+            print(f"    {name:<24} {timing}")
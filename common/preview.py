@@ -0,0 +1,67 @@
+import json
+import os
+
+import pandas as pd
+
+from common.columnar import CACHE_DIRNAME, replace, temp_path
+
+PREVIEW_ROWS = 100
+
+
+def read_preview(source: str, nrows: int = PREVIEW_ROWS, **kwargs) -> pd.DataFrame:
+    # Parses only the first rows of the file
+    return pd.read_csv(source, nrows=nrows, **kwargs)
+
+
+def metadata_path(source: str, name: str) -> str:
+    return os.path.join(os.path.dirname(source), CACHE_DIRNAME, f"{name}.meta.json")
+
+
+def source_stamp(source: str) -> dict:
+    # Size and mtime tell whether the metadata is stale without reading the file
+    stat = os.stat(source)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def describe(df: pd.DataFrame) -> dict:
+    missing = df.isna().sum()
+    return {
+        "rows": len(df),
+        "columns": [
+            {"name": str(col), "dtype": str(df[col].dtype), "missing": int(missing[col])}
+            for col in df.columns
+        ],
+    }
+
+
+def write_metadata(source: str, name: str, df: pd.DataFrame) -> None:
+    """Record the shape, dtypes and missing values of the full `df` parsed
+    from `source`, so previews can show them without loading it."""
+    target = metadata_path(source, name)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    tmp = temp_path(target)
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"source": source_stamp(source), **describe(df)}, f)
+    replace(tmp, target)
+
+
+def read_metadata(source: str, name: str) -> dict | None:
+    # None when the full file hasn't been ingested since it last changed
+    target = metadata_path(source, name)
+    if not os.path.exists(target):
+        return None
+    with open(target, encoding="utf-8") as f:
+        metadata = json.load(f)
+    return metadata if metadata.get("source") == source_stamp(source) else None
+
+
+def ensure_metadata(source: str, name: str, df: pd.DataFrame) -> pd.DataFrame:
+    if read_metadata(source, name) is None:
+        write_metadata(source, name, df)
+    return df
+
+
+def columns_frame(metadata: dict) -> pd.DataFrame:
+    columns = pd.DataFrame(metadata["columns"]).set_index("name")
+    columns["missing %"] = (columns["missing"] / max(metadata["rows"], 1) * 100).round(1)
+    return columns
@@ -0,0 +1,157 @@
+"""Precomputed dataset profiles.
+
+`python -m common.profile` loads every dataset once and writes a JSON
+sidecar per dataset with column statistics and per-group summaries of its
+main filter keys. Pages read these instead of recomputing the numbers on
+every rerun and fall back to live computation when a profile is missing,
+stale or lacks the requested combination.
+"""
+import importlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from common.columnar import CACHE_DIRNAME, replace, temp_path
+from common.preview import source_stamp
+
+QUANTILES = [0.05, 0.25, 0.5, 0.75, 0.95]
+TOP_K = 20
+GROUP_STATS = ["count", "mean", "median", "min", "max", "sum"]
+
+# Modules exposing write_profile(), one per dataset
+DATASET_MODULES = ["georgy.common", "artyom.common", "edgars.common", "andrii.common"]
+
+
+def _plain(value):
+    # JSON friendly scalars
+    if value is None or value is pd.NA or value is pd.NaT:
+        return None
+    if isinstance(value, (pd.Timestamp, np.datetime64)):
+        return pd.Timestamp(value).isoformat()
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+
+def column_stats(series: pd.Series) -> dict:
+    stats = {"dtype": str(series.dtype), "missing": int(series.isna().sum()), "distinct": int(series.nunique())}
+    if pd.api.types.is_bool_dtype(series) or not (
+        pd.api.types.is_numeric_dtype(series) or pd.api.types.is_datetime64_any_dtype(series)
+    ):
+        top = series.value_counts().head(TOP_K)
+        stats["top"] = [[_plain(value), int(count)] for value, count in top.items()]
+        return stats
+
+    stats["min"] = _plain(series.min())
+    stats["max"] = _plain(series.max())
+    if pd.api.types.is_numeric_dtype(series):
+        stats["mean"] = _plain(series.mean())
+        stats["median"] = _plain(series.median())
+        stats["quantiles"] = {str(q): _plain(v) for q, v in series.quantile(QUANTILES).items()}
+    return stats
+
+
+def group_summaries(df: pd.DataFrame, keys: list[str], measures: list[str]) -> list[dict]:
+    groups = df.groupby(keys, observed=True)
+    table = groups.size().rename("size").to_frame()
+    if measures:
+        stats = groups[measures].agg(GROUP_STATS)
+        stats.columns = [f"{col}|{stat}" for col, stat in stats.columns]
+        table = table.join(stats)
+    table = table.reset_index()
+    return [{col: _plain(value) for col, value in row.items()} for row in table.to_dict("records")]
+
+
+def build_profile(df: pd.DataFrame, groups: list[list[str]], measures: list[str]) -> dict:
+    return {
+        "rows": len(df),
+        "columns": {str(col): column_stats(df[col]) for col in df.columns},
+        "groups": [{"keys": keys, "rows": group_summaries(df, keys, measures)} for keys in groups],
+    }
+
+
+def profile_path(source: str, name: str) -> str:
+    return os.path.join(os.path.dirname(source), CACHE_DIRNAME, f"{name}.profile.json")
+
+
+def _stamps(sources: list[str]) -> list[dict]:
+    return [source_stamp(path) for path in sources]
+
+
+def write_profile(
+    sources: str | list[str],
+    name: str,
+    df: pd.DataFrame,
+    groups: list[list[str]],
+    measures: list[str],
+) -> str:
+    sources = [sources] if isinstance(sources, str) else sources
+    target = profile_path(sources[0], name)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    tmp = temp_path(target)
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"sources": _stamps(sources), **build_profile(df, groups, measures)}, f)
+    replace(tmp, target)
+    return target
+
+
+class Profile:
+    def __init__(self, data: dict):
+        self.rows = data["rows"]
+        self.columns = data["columns"]
+        self._groups = {
+            tuple(group["keys"]): {tuple(row[k] for k in group["keys"]): row for row in group["rows"]}
+            for group in data["groups"]
+        }
+
+    def column(self, name: str) -> dict | None:
+        return self.columns.get(name)
+
+    def group(self, keys: list[str], values: tuple, measure: str | None = None) -> dict | None:
+        """Summary of one group, e.g. group(["regio1"], ("Bayern",), "Total rent")
+        gives its count, mean, median, min, max and sum."""
+        row = self._groups.get(tuple(keys), {}).get(tuple(values))
+        if row is None or measure is None:
+            return row
+        prefix = f"{measure}|"
+        stats = {key[len(prefix):]: value for key, value in row.items() if key.startswith(prefix)}
+        return stats or None
+
+    def groups(self, keys: list[str]) -> pd.DataFrame | None:
+        rows = self._groups.get(tuple(keys))
+        return None if rows is None else pd.DataFrame(list(rows.values()))
+
+
+_loaded: dict[str, tuple[list[dict], Profile]] = {}
+
+
+def load_profile(sources: str | list[str], name: str) -> Profile | None:
+    # None when there's no profile for the current version of the sources
+    sources = [sources] if isinstance(sources, str) else sources
+    target = profile_path(sources[0], name)
+    if not os.path.exists(target):
+        return None
+    stamps = _stamps(sources)
+    cached = _loaded.get(target)
+    if cached is not None and cached[0] == stamps:
+        return cached[1]
+
+    with open(target, encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("sources") != stamps:
+        return None
+    profile = Profile(data)
+    _loaded[target] = (stamps, profile)
+    return profile
+
+
+if __name__ == "__main__":
+    for module in DATASET_MODULES:
+        try:
+            print(importlib.import_module(module).write_profile())
+        except FileNotFoundError as e:
+            print(f"{module}: skipped, {e}")
@@ -0,0 +1,145 @@
+import logging
+from dataclasses import dataclass
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Declared column types per dataset. Columns missing from a file are
+# skipped, columns not listed are left to `compact`'s generic rules.
+SCHEMAS: dict[str, dict[str, str]] = {
+    "housing": {
+        "regio1": "category",
+        "regio2": "category",
+        "regio3": "category",
+        "geo_bln": "category",
+        "geo_krs": "category",
+        "geo_plz": "category",
+        "heatingType": "category",
+        "firingTypes": "category",
+        "condition": "category",
+        "interiorQual": "category",
+        "petsAllowed": "category",
+        "typeOfFlat": "category",
+        "energyEfficiencyClass": "category",
+        "telekomTvOffer": "category",
+        "newlyConst": "boolean",
+        "balcony": "boolean",
+        "hasKitchen": "boolean",
+        "cellar": "boolean",
+        "lift": "boolean",
+        "garden": "boolean",
+        "picturecount": "Int16",
+        "yearConstructed": "Int16",
+        "yearConstructedRange": "Int8",
+        "noParkSpaces": "Int16",
+        "floor": "Int16",
+        "numberOfFloors": "Int16",
+        "baseRentRange": "Int8",
+        "noRoomsRange": "Int8",
+        "livingSpaceRange": "Int8",
+        "lastRefurbish": "Int16",
+        "serviceCharge": "float32",
+        "heatingCosts": "float32",
+        "livingSpace": "float32",
+        "noRooms": "float32",
+        "thermalChar": "float32",
+        "pricetrend": "float32",
+    },
+    "airbnb": {
+        "room_type": "category",
+        "room_shared": "boolean",
+        "room_private": "boolean",
+        "host_is_superhost": "boolean",
+        "person_capacity": "Int8",
+        "multi": "Int8",
+        "biz": "Int8",
+        "bedrooms": "Int8",
+        "cleanliness_rating": "float32",
+        "guest_satisfaction_overall": "float32",
+        "dist": "float32",
+        "metro_dist": "float32",
+        "attr_index": "float32",
+        "attr_index_norm": "float32",
+        "rest_index": "float32",
+        "rest_index_norm": "float32",
+    },
+    "border_crossings": {
+        "Port Name": "category",
+        "State": "category",
+        "Port Code": "int32",
+        "Border": "category",
+        "Measure": "category",
+        "Value": "int32",
+    },
+    "netflix": {
+        "type": "category",
+        "rating": "category",
+        "duration": "category",
+        "country": "category",
+        "listed_in": "category",
+        "release_year": "int16",
+    },
+}
+
+# Text columns with at most this share of distinct values become categoricals
+CATEGORY_RATIO = 0.5
+
+
+@dataclass
+class MemoryReport:
+    dataset: str
+    bytes_before: int
+    bytes_after: int
+
+    def __str__(self) -> str:
+        saved = 1 - self.bytes_after / self.bytes_before if self.bytes_before else 0
+        return (
+            f"{self.dataset}: {self.bytes_before / 1024 ** 2:.1f} MB -> "
+            f"{self.bytes_after / 1024 ** 2:.1f} MB ({saved:.0%} saved)"
+        )
+
+
+# Latest report per dataset, for debugging and the benchmarks
+reports: dict[str, MemoryReport] = {}
+
+
+def frame_bytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(deep=True).sum())
+
+
+def apply_schema(df: pd.DataFrame, schema: dict[str, str]) -> pd.DataFrame:
+    df = df.copy(deep=False)
+    for col, dtype in schema.items():
+        if col not in df.columns:
+            continue
+        try:
+            df[col] = df[col].astype(dtype)
+        except (TypeError, ValueError) as e:
+            # Keep the parsed type rather than failing the whole load
+            logger.warning("Could not cast %s to %s: %s", col, dtype, e)
+    return df
+
+
+def compact(df: pd.DataFrame, dataset: str, name: str | None = None) -> pd.DataFrame:
+    """Cast `df` to the declared schema of `dataset`, then downcast the
+    remaining integer columns and turn repetitive text into categoricals.
+    The memory report is kept under `name`, defaulting to `dataset`."""
+    schema = SCHEMAS.get(dataset, {})
+    before = frame_bytes(df)
+
+    df = apply_schema(df, schema)
+    for col in df.columns:
+        if col in schema:
+            continue
+        series = df[col]
+        if pd.api.types.is_integer_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            df[col] = pd.to_numeric(series, downcast="integer")
+        elif (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)) \
+                and len(series) and series.nunique() <= CATEGORY_RATIO * len(series):
+            df[col] = series.astype("category")
+
+    report = MemoryReport(name or dataset, before, frame_bytes(df))
+    reports[report.dataset] = report
+    logger.info("Compacted %s", report)
+    return df
@@ -0,0 +1,195 @@
+"""Mergeable quantile sketches per filter partition.
+
+Values are counted in logarithmically sized buckets, so every quantile is
+answered within `relative_error` of the true value and the sketches of
+several partitions merge by adding their bucket counts. A `SketchTable`
+holds one sketch per combination of its key columns, which turns the
+median of any filter selection into a sum over a few rows of counts
+instead of a sort of the filtered column.
+
+Set EXACT_QUANTILES=1 to answer from the raw values instead, e.g. to
+validate the sketches against the exact numbers.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+RELATIVE_ERROR = float(os.environ.get("SKETCH_RELATIVE_ERROR", "0.01"))
+EXACT_QUANTILES = os.environ.get("EXACT_QUANTILES", "") == "1"
+
+# Magnitudes below this are counted as zero
+MIN_MAGNITUDE = 1e-9
+
+
+class _Buckets:
+    """Bucket layout of one measure: negative buckets in reverse, a zero
+    bucket, then positive buckets, so that bucket order is value order."""
+
+    def __init__(self, values: np.ndarray, relative_error: float):
+        self.gamma = (1 + relative_error) / (1 - relative_error)
+        self._log_gamma = np.log(self.gamma)
+        keys = self._keys(values[np.abs(values) >= MIN_MAGNITUDE])
+        self.min_key = int(keys.min()) if keys.size else 0
+        self.size = (int(keys.max()) - self.min_key + 1) if keys.size else 0
+
+    @property
+    def width(self) -> int:
+        return 2 * self.size + 1
+
+    def _keys(self, values: np.ndarray) -> np.ndarray:
+        return np.ceil(np.log(np.abs(values)) / self._log_gamma).astype("int64")
+
+    def slots(self, values: np.ndarray) -> np.ndarray:
+        # Missing values get -1
+        slots = np.full(values.shape, -1, dtype="int64")
+        magnitude = np.abs(values)
+        zero = magnitude < MIN_MAGNITUDE
+        slots[zero] = self.size
+        nonzero = ~zero & np.isfinite(values)
+        offsets = self._keys(values[nonzero]) - self.min_key
+        slots[nonzero] = np.where(values[nonzero] > 0, self.size + 1 + offsets, self.size - 1 - offsets)
+        return slots
+
+    def values(self) -> np.ndarray:
+        # Representative value of every slot, within the relative error of its members
+        offsets = np.arange(self.size)
+        magnitude = 2 * self.gamma ** (offsets + self.min_key) / (self.gamma + 1)
+        return np.concatenate([-magnitude[::-1], [0.0], magnitude])
+
+
+class SketchTable:
+    """Quantile sketch, count, sum, min and max of every measure for each
+    combination of `keys` in `df`.
+
+    Selections are keyword arguments naming key values, e.g.
+    ``table.summary("realSum", city=["Berlin", "Paris"], room_type="Private room")``;
+    keys left out are not filtered on.
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        keys: list[str],
+        measures: list[str],
+        relative_error: float = RELATIVE_ERROR,
+        exact: bool = EXACT_QUANTILES,
+    ):
+        self.keys = keys
+        self.measures = measures
+        self.relative_error = relative_error
+
+        groups = df.groupby(keys, observed=True, dropna=False, sort=True)
+        codes = groups.ngroup().to_numpy()
+        self.partitions = groups.size().index.to_frame(index=False)
+        n = len(self.partitions)
+
+        self._buckets: dict[str, _Buckets] = {}
+        self._counts: dict[str, np.ndarray] = {}
+        self._totals: dict[str, pd.DataFrame] = {}
+        for measure in measures:
+            values = df[measure].to_numpy(dtype="float64", na_value=np.nan)
+            buckets = _Buckets(values, relative_error)
+            slots = buckets.slots(values)
+            valid = slots >= 0
+
+            flat = codes[valid] * buckets.width + slots[valid]
+            self._buckets[measure] = buckets
+            self._counts[measure] = np.bincount(flat, minlength=n * buckets.width).reshape(n, buckets.width)
+            self._totals[measure] = (
+                pd.Series(values[valid])
+                .groupby(codes[valid])
+                .agg(["sum", "min", "max"])
+                .reindex(range(n))
+            )
+
+        # Raw values, kept only to answer exactly
+        self._exact = df[keys + measures].reset_index(drop=True) if exact else None
+        self._codes = codes if exact else None
+
+    @property
+    def nbytes(self) -> int:
+        total = sum(counts.nbytes for counts in self._counts.values())
+        if self._exact is not None:
+            total += int(self._exact.memory_usage(deep=True).sum()) + self._codes.nbytes
+        return total
+
+    def mask(self, **selection) -> np.ndarray:
+        # Partitions matching the selection
+        mask = np.ones(len(self.partitions), dtype=bool)
+        for key, values in selection.items():
+            if values is None:
+                continue
+            if key not in self.keys:
+                raise KeyError(f"{key!r} is not a key of this sketch table, expected one of {self.keys}")
+            if np.isscalar(values):
+                values = [values]
+            mask &= self.partitions[key].isin(values).to_numpy()
+        return mask
+
+    def _exact_values(self, measure: str, mask: np.ndarray) -> pd.Series:
+        return self._exact.loc[mask[self._codes], measure].dropna()
+
+    def quantiles(self, measure: str, q: list[float], **selection) -> np.ndarray:
+        mask = self.mask(**selection)
+        if self._exact is not None:
+            return self._exact_values(measure, mask).quantile(q).to_numpy()
+
+        counts = self._counts[measure][mask].sum(axis=0)
+        cumulative = np.cumsum(counts)
+        total = cumulative[-1] if cumulative.size else 0
+        if not total:
+            return np.full(len(q), np.nan)
+        # Interpolated between the neighbouring ranks, like pandas does
+        ranks = np.asarray(q, dtype="float64") * (total - 1)
+        lower, upper = np.floor(ranks), np.ceil(ranks)
+        values = self._buckets[measure].values()
+        low = values[np.searchsorted(cumulative, lower, side="right")]
+        high = values[np.searchsorted(cumulative, upper, side="right")]
+        return low + (ranks - lower) * (high - low)
+
+    def quantile(self, measure: str, q: float, **selection) -> float:
+        return float(self.quantiles(measure, [q], **selection)[0])
+
+    def summary(self, measure: str, **selection) -> dict:
+        """count, mean, median, min and max of the selection. Everything but
+        the median is exact."""
+        mask = self.mask(**selection)
+        if self._exact is not None:
+            values = self._exact_values(measure, mask)
+            return {
+                "count": len(values),
+                "mean": values.mean(),
+                "median": values.median(),
+                "min": values.min(),
+                "max": values.max(),
+            }
+
+        totals = self._totals[measure][mask]
+        count = int(self._counts[measure][mask].sum())
+        return {
+            "count": count,
+            "mean": float(totals["sum"].sum() / count) if count else np.nan,
+            "median": self.quantile(measure, 0.5, **selection),
+            "min": float(totals["min"].min()),
+            "max": float(totals["max"].max()),
+        }
+
+
+def compare(table: SketchTable, df: pd.DataFrame, measure: str, q: list[float]) -> pd.DataFrame:
+    """Sketch against exact quantiles for every partition of `table`, with
+    the relative error of each, for validating `relative_error`."""
+    exact = df.groupby(table.keys, observed=True, dropna=False, sort=True)[measure].quantile(q).unstack()
+    rows = []
+    for i, partition in table.partitions.iterrows():
+        selection = {key: [partition[key]] for key in table.keys}
+        approx = table.quantiles(measure, q, **selection)
+        for quantile, value, true in zip(q, approx, exact.iloc[i]):
+            rows.append({
+                **partition.to_dict(),
+                "q": quantile,
+                "sketch": value,
+                "exact": true,
+                "relative_error": abs(value - true) / abs(true) if true else abs(value),
+            })
+    return pd.DataFrame(rows)
@@ -0,0 +1,118 @@
+"""Render every page through app.py with streamlit's AppTest.
+
+Run from the repository root with
+
+    python -m common.smoke
+    python -m common.smoke --pages georgy/exploration.py --scale 2
+
+Synthetic datasets (see common.synthetic) are written to a temporary
+directory and every page is run there, first with its defaults and then
+with each of the widget changes in CHANGES. Unlike common.bench, which
+replaces streamlit with a stub, this renders real elements, so it also
+catches failures inside streamlit itself, e.g. values st.map cannot
+serialize. The word forms in andrii.search.SAME_STEM are checked to share
+a stem as well. Exits with status 1 if any check failed.
+"""
+import argparse
+import os
+import sys
+import tempfile
+from typing import Callable
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(REPO, "app.py")
+
+PAGES = [
+    "andrii/overview.py",
+    "andrii/exploration.py",
+    "artyom/overview.py",
+    "artyom/exploration.py",
+    "edgars/overview.py",
+    "edgars/exploration.py",
+    "georgy/overview.py",
+    "georgy/exploration.py",
+]
+
+TIMEOUT = 120
+
+
+def _widget(elements, label: str):
+    return next(element for element in elements if element.label == label)
+
+
+# Widget changes applied one after another on top of the defaults, per page
+CHANGES: dict[str, dict[str, Callable]] = {
+    "andrii/exploration.py": {
+        "search": lambda at: _widget(at.text_input, "Search titles, descriptions, cast and directors").input("love"),
+    },
+    "artyom/exploration.py": {
+        "colour by satisfaction": lambda at: _widget(at.selectbox, "Visualize as color").select("guest_satisfaction_overall"),
+    },
+    "edgars/exploration.py": {
+        "data table": lambda at: _widget(at.checkbox, "Show data table:").check(),
+    },
+    "georgy/exploration.py": {
+        "Bremen": lambda at: _widget(at.selectbox, "Bundesland").select("Bremen"),
+        "base rent": lambda at: _widget(at.radio, "Rent price").set_value("Base rent"),
+    },
+}
+
+
+def check_page(page: str) -> list[tuple[str, str]]:
+    # (run, error) for every run of `page` that raised
+    from streamlit.testing.v1 import AppTest
+
+    from common.warmup import warmup
+
+    at = AppTest.from_file(APP, default_timeout=TIMEOUT)
+    at.run()
+    # Pages show a placeholder until their dataset is warm
+    warmup.wait()
+
+    failures = []
+    runs = {"default": lambda at: at.switch_page(page), **CHANGES.get(page, {})}
+    for name, change in runs.items():
+        try:
+            change(at).run()
+        except Exception as e:  # e.g. a widget the run before never rendered
+            failures.append((name, f"{type(e).__name__}: {e}"))
+            break
+        failures += [(name, exception.message) for exception in at.exception]
+    return failures
+
+
+def check_stems() -> list[tuple[str, str]]:
+    from andrii.search import stem_mismatches
+
+    return [("stemming", f"{', '.join(forms)} don't share a stem") for forms in stem_mismatches()]
+
+
+def run(pages: list[str], scale: int = 1) -> dict[str, list[tuple[str, str]]]:
+    from common.synthetic import write_datasets
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="smoke-") as root:
+        write_datasets(root, scale, repo=REPO)
+        # Pages also read assets such as images relative to the repository root
+        for entry in os.listdir(REPO):
+            if not os.path.exists(os.path.join(root, entry)):
+                os.symlink(os.path.join(REPO, entry), os.path.join(root, entry))
+        os.chdir(root)
+        try:
+            return {page: check_page(page) for page in pages}
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", nargs="+", choices=PAGES, default=PAGES)
+    parser.add_argument("--scale", type=int, default=1)
+    args = parser.parse_args()
+
+    results = {"andrii/search.py": check_stems(), **run(args.pages, args.scale)}
+    for page, failures in results.items():
+        print(f"{'FAIL' if failures else 'ok':>4}  {page}")
+        for name, error in failures:
+            print(f"      {name}: {error}")
+    sys.exit(1 if any(results.values()) else 0)
@@ -0,0 +1,111 @@
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, TypeVar
+
+import pandas as pd
+
+from common.columnar import file_hash
+
+DEFAULT_MAX_BYTES = int(os.environ.get("DATASET_STORE_MAX_MB", "2048")) * 1024 ** 2
+
+T = TypeVar("T")
+
+
+@dataclass
+class Entry:
+    version: str
+    value: Any
+    nbytes: int
+    hits: int = 0
+
+
+class DatasetStore:
+    """Process-wide registry of prepared datasets shared by every session.
+
+    Holds one frame (or derived structure such as an index) per dataset
+    name, the latest version requested, and evicts the least recently used
+    ones once `max_bytes` is exceeded. Values are shared, so callers must
+    never modify them in place.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._build_locks: dict[str, threading.Lock] = {}
+
+    def get(self, name: str, version: str, build: Callable[[], T]) -> T:
+        with self._lock:
+            entry = self._hit(name, version)
+            if entry is not None:
+                return entry.value
+            build_lock = self._build_locks.setdefault(name, threading.Lock())
+
+        # Only one session builds a given dataset, the others wait for it
+        with build_lock:
+            with self._lock:
+                entry = self._hit(name, version)
+                if entry is not None:
+                    return entry.value
+
+            value = build()
+            entry = Entry(version, value, sizeof(value))
+
+            with self._lock:
+                self._entries[name] = entry
+                self._entries.move_to_end(name)
+                self._evict(keep=name)
+            return value
+
+    def _hit(self, name: str, version: str) -> Entry | None:
+        entry = self._entries.get(name)
+        if entry is None or entry.version != version:
+            return None
+        entry.hits += 1
+        self._entries.move_to_end(name)
+        return entry
+
+    def _evict(self, keep: str) -> None:
+        while self.total_bytes() > self.max_bytes:
+            name = next((n for n in self._entries if n != keep), None)
+            if name is None:
+                break
+            del self._entries[name]
+
+    def total_bytes(self) -> int:
+        return sum(entry.nbytes for entry in self._entries.values())
+
+    def stats(self) -> pd.DataFrame:
+        with self._lock:
+            return pd.DataFrame(
+                [
+                    {"dataset": name, "version": e.version, "bytes": e.nbytes, "hits": e.hits}
+                    for name, e in self._entries.items()
+                ],
+                columns=["dataset", "version", "bytes", "hits"],
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def sizeof(value: Any) -> int:
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(value.memory_usage(deep=True).sum())
+    return int(getattr(value, "nbytes", 0))
+
+
+store = DatasetStore()
+
+
+def shared(name: str, source: str | list[str], build: Callable[[], T]) -> T:
+    # The source files' hashes are the dataset version
+    sources = [source] if isinstance(source, str) else source
+    return store.get(name, "-".join(file_hash(path) for path in sources), build)
+
+
+def shared_frame(name: str, source: str | list[str], build: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+    return shared(name, source, build)
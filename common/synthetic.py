@@ -0,0 +1,137 @@
+"""Synthetic copies of every dataset at a multiple of its real size.
+
+`write_datasets(root, scale)` lays out a `data/` tree under `root` shaped
+like the repository's, so pages and loaders run unchanged from `root`.
+Bundled CSVs are resampled with replacement; the housing and border
+crossing CSVs aren't bundled and are generated from their published row
+counts and column layout instead.
+"""
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+# Row counts of the published datasets that aren't in the repository
+HOUSING_ROWS = 268_850
+BORDER_ROWS = 400_000
+
+STATES = [
+    "Nordrhein_Westfalen", "Rheinland_Pfalz", "Sachsen", "Bremen", "Schleswig_Holstein",
+    "Baden_Württemberg", "Thüringen", "Hessen", "Niedersachsen", "Bayern", "Hamburg",
+    "Sachsen_Anhalt", "Mecklenburg_Vorpommern", "Berlin", "Brandenburg", "Saarland",
+]
+MEASURES = [
+    "Bus Passengers", "Buses", "Pedestrians", "Personal Vehicle Passengers", "Personal Vehicles",
+    "Rail Containers Empty", "Rail Containers Loaded", "Train Passengers", "Trains",
+    "Truck Containers Empty", "Truck Containers Loaded", "Trucks",
+]
+BORDERS = {"US-Canada Border": ["ME", "VT", "NY", "MI", "MN", "ND", "MT", "ID", "WA", "AK"],
+           "US-Mexico Border": ["CA", "AZ", "NM", "TX"]}
+PORTS = 120
+
+# Lookup tables copied as they are
+LOOKUPS = ["data/georgy/de.csv", "data/andrii/country_centroids.csv", "data/andrii/country_aliases.csv"]
+
+SEED = 0
+
+
+def resample(source: str, target: str, scale: int, seed: int = SEED) -> int:
+    # The file itself at scale 1, rows drawn with replacement otherwise
+    df = pd.read_csv(source)
+    if scale == 1:
+        shutil.copyfile(source, target)
+    else:
+        df = df.sample(n=len(df) * scale, replace=True, random_state=seed)
+        df.to_csv(target, index=False)
+    return len(df)
+
+
+def housing(rows: int, postcodes: np.ndarray, seed: int = SEED) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    base_rent = rng.lognormal(6.5, 0.5, rows).round(2)
+    total_rent = (base_rent * rng.uniform(1.1, 1.4, rows)).round(2)
+    total_rent[rng.random(rows) < 0.15] = np.nan
+    states = rng.choice(STATES, rows)
+    return pd.DataFrame({
+        "regio1": states,
+        "serviceCharge": (total_rent - base_rent).round(2),
+        "heatingType": rng.choice(["central_heating", "gas_heating", "district_heating"], rows),
+        "telekomTvOffer": rng.choice(["ONE_YEAR_FREE", "NONE"], rows),
+        "telekomHybridUploadSpeed": np.where(rng.random(rows) < 0.2, 10.0, np.nan),
+        "newlyConst": rng.random(rows) < 0.1,
+        "balcony": rng.random(rows) < 0.6,
+        "picturecount": rng.integers(0, 30, rows),
+        "pricetrend": rng.normal(3, 2, rows).round(2),
+        "totalRent": total_rent,
+        "yearConstructed": rng.integers(1900, 2020, rows),
+        "scoutId": np.arange(rows) + 100_000_000,
+        "firingTypes": rng.choice(["gas", "oil", "district_heating"], rows),
+        "hasKitchen": rng.random(rows) < 0.4,
+        "geo_bln": states,
+        "cellar": rng.random(rows) < 0.6,
+        "baseRent": base_rent,
+        "livingSpace": rng.uniform(20, 200, rows).round(1),
+        "geo_plz": rng.choice(postcodes, rows),
+        "street": "no_information",
+        "noRooms": rng.integers(1, 6, rows),
+        "floor": rng.integers(0, 10, rows),
+        "lift": rng.random(rows) < 0.3,
+        "typeOfFlat": rng.choice(["apartment", "roof_storey", "ground_floor"], rows),
+        "energyEfficiencyClass": rng.choice(["A", "B", "C", "D"], rows),
+        "lastRefurbish": rng.integers(1990, 2020, rows),
+        "electricityBasePrice": 90.76,
+        "electricityKwhPrice": 0.1985,
+        "date": rng.choice(["May19", "Oct19", "Sep18", "Feb20"], rows),
+    })
+
+
+def border_crossings(rows: int, seed: int = SEED) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    borders = rng.choice(list(BORDERS), PORTS)
+    ports = pd.DataFrame({
+        "Port Name": [f"Port {i}" for i in range(PORTS)],
+        "State": [rng.choice(BORDERS[border]) for border in borders],
+        "Port Code": 3000 + np.arange(PORTS),
+        "Border": borders,
+        "Latitude": rng.uniform(25, 49, PORTS).round(3),
+        "Longitude": rng.uniform(-125, -67, PORTS).round(3),
+    })
+    dates = pd.date_range("1996-01-01", "2025-02-01", freq="MS").strftime("%b %Y")
+
+    df = ports.iloc[rng.integers(0, PORTS, rows)].reset_index(drop=True)
+    df.insert(4, "Date", rng.choice(dates, rows))
+    df.insert(5, "Measure", rng.choice(MEASURES, rows))
+    df.insert(6, "Value", rng.lognormal(6, 2.5, rows).astype("int64").clip(0, 2**31 - 1))
+    df["Point"] = "POINT (" + df["Longitude"].astype(str) + " " + df["Latitude"].astype(str) + ")"
+    return df
+
+
+def write_datasets(root: str, scale: int, repo: str = ".") -> dict[str, int]:
+    """Write every dataset at `scale` times its size under `root`, returning
+    the rows written per file."""
+    for path in LOOKUPS:
+        os.makedirs(os.path.join(root, os.path.dirname(path)), exist_ok=True)
+        shutil.copyfile(os.path.join(repo, path), os.path.join(root, path))
+
+    rows = {}
+    bundled = ["data/andrii/netflix_titles.csv"] + sorted(
+        os.path.join("data/artyom", name)
+        for name in os.listdir(os.path.join(repo, "data/artyom"))
+        if name.endswith(".csv")
+    )
+    for path in bundled:
+        os.makedirs(os.path.join(root, os.path.dirname(path)), exist_ok=True)
+        rows[path] = resample(os.path.join(repo, path), os.path.join(root, path), scale)
+
+    postcodes = pd.read_csv(os.path.join(repo, "data/georgy/de.csv"))["postcode"].to_numpy()
+    generated = {
+        "data/georgy/germany_housing.csv": lambda: housing(HOUSING_ROWS * scale, postcodes),
+        "data/edgars/Border_Crossing_Entry_Data.csv": lambda: border_crossings(BORDER_ROWS * scale),
+    }
+    for path, generate in generated.items():
+        os.makedirs(os.path.join(root, os.path.dirname(path)), exist_ok=True)
+        df = generate()
+        df.to_csv(os.path.join(root, path), index=False)
+        rows[path] = len(df)
+    return rows
@@ -0,0 +1,183 @@
+"""Opt-in timing of every rerun's data and render stages.
+
+Start the app with TRACE_RERUNS=1 to record a span for every `@traced`
+function and `with span(...)` block a rerun passes through, with its
+duration and, for frames, its row count and size. app.py shows the spans
+of the last rerun in a sidebar panel, which also offers them as a Chrome
+trace file (open in chrome://tracing or https://ui.perfetto.dev).
+
+When disabled, `traced` returns functions unchanged and `span` does
+nothing, so the hooks cost nothing in production.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Iterator
+
+# Imported by app.py on every page, so pandas and numpy are only loaded where used
+if TYPE_CHECKING:
+    import pandas as pd
+
+ENABLED = os.environ.get("TRACE_RERUNS", "") == "1"
+
+
+@dataclass
+class Span:
+    name: str
+    start: float
+    depth: int
+    thread: int
+    duration: float = 0.0
+    attrs: dict[str, Any] = field(default_factory=dict)
+
+
+class Trace:
+    """Spans recorded during one rerun, in the order they started."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.spans: list[Span] = []
+        self.depth = 0
+
+    def to_frame(self) -> "pd.DataFrame":
+        import pandas as pd
+
+        return pd.DataFrame(
+            [
+                {
+                    "stage": "  " * s.depth + s.name,
+                    "ms": s.duration * 1000,
+                    "rows": s.attrs.get("rows"),
+                    "bytes": s.attrs.get("bytes"),
+                }
+                for s in self.spans
+            ],
+            columns=["stage", "ms", "rows", "bytes"],
+        )
+
+    def to_chrome(self) -> dict:
+        # Complete ("X") events in microseconds, see the Trace Event Format
+        origin = self.spans[0].start if self.spans else 0.0
+        return {
+            "traceEvents": [
+                {
+                    "name": s.name,
+                    "cat": self.name,
+                    "ph": "X",
+                    "ts": (s.start - origin) * 1e6,
+                    "dur": s.duration * 1e6,
+                    "pid": os.getpid(),
+                    "tid": s.thread,
+                    "args": s.attrs,
+                }
+                for s in self.spans
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def write(self, path: str) -> str:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome(), f, default=str)
+        return path
+
+
+_current: ContextVar[Trace | None] = ContextVar("trace", default=None)
+
+
+def payload(value: Any) -> dict[str, int]:
+    # Row count and size of frames and arrays, nothing for anything else.
+    # Whatever is passed in was made with pandas or numpy, so they are loaded by then
+    import numpy as np
+    import pandas as pd
+
+    if hasattr(value, "points") and isinstance(value.points, pd.DataFrame):
+        value = value.points
+    if isinstance(value, pd.DataFrame):
+        return {"rows": len(value), "bytes": int(value.memory_usage(index=True).sum())}
+    if isinstance(value, pd.Series):
+        return {"rows": len(value), "bytes": int(value.memory_usage(index=True))}
+    if isinstance(value, np.ndarray):
+        return {"rows": len(value), "bytes": value.nbytes}
+    return {}
+
+
+@contextmanager
+def span(name: str, **attrs) -> Iterator[Span | None]:
+    trace = _current.get()
+    if trace is None:
+        yield None
+        return
+    s = Span(name, time.perf_counter(), trace.depth, threading.get_ident(), attrs=attrs)
+    trace.spans.append(s)
+    trace.depth += 1
+    try:
+        yield s
+    finally:
+        s.duration = time.perf_counter() - s.start
+        trace.depth -= 1
+
+
+def traced(func: Callable | None = None, *, name: str | None = None) -> Callable:
+    """Record a span for every call of the decorated function, with the
+    payload of what it returns. Usable as @traced or @traced(name=...)."""
+    if func is None:
+        return lambda f: traced(f, name=name)
+    if not ENABLED:
+        return func
+    label = name or f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with span(label) as s:
+            result = func(*args, **kwargs)
+            if s is not None:
+                s.attrs.update(payload(result))
+            return result
+
+    return wrapper
+
+
+@contextmanager
+def rerun(name: str) -> Iterator[Trace | None]:
+    # Collects the spans of one script run, None when tracing is disabled
+    if not ENABLED:
+        yield None
+        return
+    trace = Trace(name)
+    token = _current.set(trace)
+    try:
+        with span(name):
+            yield trace
+    finally:
+        _current.reset(token)
+
+
+def debug_panel(trace: Trace | None) -> None:
+    if trace is None:
+        return
+    import streamlit as st
+
+    with st.sidebar.expander("Rerun timings"):
+        st.dataframe(
+            trace.to_frame().style.format({"ms": "{:.1f}", "rows": "{:.0f}", "bytes": "{:,.0f}"}, na_rep=""),
+            hide_index=True,
+        )
+        st.download_button(
+            "Download Chrome trace",
+            json.dumps(trace.to_chrome(), default=str),
+            file_name="rerun-trace.json",
+            mime="application/json",
+        )
+
+        from common.figures import figure_cache
+
+        stats = figure_cache.stats()
+        st.caption(
+            f"Figure cache: {stats['hits']} hits, {stats['misses']} misses, "
+            f"{stats['entries']} figures ({stats['bytes'] / 1024 ** 2:.1f} MB)"
+        )
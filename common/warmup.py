@@ -0,0 +1,121 @@
+"""Background warm-up of every dataset at server start.
+
+app.py starts `warmup` on its first run. A thread pool then calls every
+dataset's `warm()` concurrently, which loads, preprocesses and indexes
+what the dataset's default page view needs into the dataset store. Pages
+call `placeholder()` first, so a visitor arriving mid warm-up gets a
+short message and an automatic rerun instead of a blocked page.
+
+`python -m common.warmup` runs the same tasks in the foreground, e.g. as
+a deploy step so the Parquet and index caches exist before the first
+server starts.
+"""
+import importlib
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Query module of every dataset, each with a warm() function
+DATASETS = {
+    "housing": "queries.housing",
+    "airbnb": "queries.airbnb",
+    "border_crossings": "queries.border_crossings",
+    "netflix": "queries.netflix",
+}
+
+# How often a placeholder page checks again
+POLL_SECONDS = 1.0
+
+
+@dataclass
+class Task:
+    name: str
+    state: str = "pending"
+    seconds: float | None = None
+    error: str | None = None
+
+
+class Warmup:
+    """Readiness of every dataset: "idle" until `start`, then "pending",
+    "running", and "ready" or "failed"."""
+
+    def __init__(self, datasets: dict[str, str] = DATASETS):
+        self.datasets = datasets
+        self._tasks: dict[str, Task] = {}
+        self._futures = []
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        # Only the first call starts anything, later reruns are no-ops
+        with self._lock:
+            if self._tasks:
+                return
+            executor = ThreadPoolExecutor(max_workers=len(self.datasets), thread_name_prefix="warmup")
+            for name, module in self.datasets.items():
+                self._tasks[name] = Task(name)
+                self._futures.append(executor.submit(self._run, self._tasks[name], module))
+            executor.shutdown(wait=False)
+
+    def _run(self, task: Task, module: str) -> None:
+        task.state = "running"
+        start = time.perf_counter()
+        try:
+            importlib.import_module(module).warm()
+        except Exception as e:
+            task.error = f"{type(e).__name__}: {e}"
+            task.state = "failed"
+            logger.exception("Warm-up of %s failed", task.name)
+        else:
+            task.state = "ready"
+        finally:
+            task.seconds = time.perf_counter() - start
+        logger.info("Warm-up of %s %s in %.2fs", task.name, task.state, task.seconds)
+
+    def state(self, name: str) -> str:
+        task = self._tasks.get(name)
+        return "idle" if task is None else task.state
+
+    def ready(self, name: str) -> bool:
+        return self.state(name) == "ready"
+
+    def wait(self, timeout: float | None = None) -> None:
+        wait(self._futures, timeout=timeout)
+
+    def status(self) -> "pd.DataFrame":
+        import pandas as pd
+
+        return pd.DataFrame(
+            [vars(self._tasks.get(name, Task(name, "idle"))) for name in self.datasets],
+            columns=["name", "state", "seconds", "error"],
+        )
+
+
+warmup = Warmup()
+
+
+def placeholder(name: str, label: str) -> None:
+    """Show a placeholder and rerun shortly while `name` is still warming
+    up. Returns straight away once it's ready, if it failed (the page then
+    loads it itself and shows the error) or if warm-up was never started."""
+    if warmup.state(name) not in ("pending", "running"):
+        return
+    import streamlit as st
+
+    st.info(f"Preparing the {label} dataset, the page will appear in a moment.")
+    time.sleep(POLL_SECONDS)
+    st.rerun()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    warmup.start()
+    warmup.wait()
+    print(warmup.status().to_string(index=False))
@@ -0,0 +1,78 @@
+import os
+
+import pandas as pd
+
+from common.columnar import mapped_frame, read_mapped
+from common.filters import FilterIndex
+from common.profile import Profile, load_profile as _load_profile, write_profile as _write_profile
+from common.store import shared
+from common.trace import traced
+from edgars.ingest import DATA_PATH, INGEST_VERSION, Ingested, ingest, rows_path
+
+# Columns the sidebar filters on
+FILTER_COLUMNS = ["Measure", "Border", "Year"]
+
+# Filter keys summarized in the dataset profile
+PROFILE_GROUPS = [["Measure"], ["Border"], ["Year"]]
+
+def map_ingested() -> Ingested:
+    # Ingested once per dataset version, then mapped from Arrow files by every process
+    built = []
+
+    def build_cube() -> pd.DataFrame:
+        built.append(ingest())
+        return built[0].cube
+
+    cube = mapped_frame(DATA_PATH, "crossings-cube", build_cube, version=INGEST_VERSION)
+    if not built and not os.path.exists(rows_path()):
+        built.append(ingest())
+    df = built[0].df if built else read_mapped(rows_path())
+    return Ingested(df, cube, built[0].report if built else None)
+
+def load_ingested():
+    # Shared by all sessions of this process
+    return shared("edgars/ingested", DATA_PATH, map_ingested)
+
+def load_data():
+    # One copy shared by all sessions, must not be modified in place
+    return load_ingested().df
+
+def load_filter_index():
+    # Bitmaps for every sidebar filter, built once per dataset version
+    return shared(
+        "edgars/filter_index",
+        DATA_PATH,
+        lambda: FilterIndex(load_data(), FILTER_COLUMNS),
+    )
+
+
+@traced
+def rollup(cube: pd.DataFrame, keys: list[str]) -> pd.DataFrame:
+    return cube.groupby(keys, observed=True)["Value"].sum().reset_index()
+
+def load_cube():
+    # Aggregated while the CSV was streamed in
+    return load_ingested().cube
+
+def load_time_cube():
+    # Crossings per date for every filter combination, for the line chart
+    return shared(
+        "edgars/time_cube",
+        DATA_PATH,
+        lambda: FilterIndex(rollup(load_cube(), ["Date", "Year", "Measure", "Border"]), FILTER_COLUMNS),
+    )
+
+def load_port_cube():
+    # Crossings per port and year for every filter combination, for the top ports chart
+    return shared(
+        "edgars/port_cube",
+        DATA_PATH,
+        lambda: FilterIndex(rollup(load_cube(), ["Year", "Measure", "Border", "Port Name"]), FILTER_COLUMNS),
+    )
+
+
+def write_profile() -> str:
+    return _write_profile(DATA_PATH, "border_crossings", load_data(), PROFILE_GROUPS, ["Value"])
+
+def load_profile() -> Profile | None:
+    return _load_profile(DATA_PATH, "border_crossings")
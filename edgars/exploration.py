@@ -1,31 +1,19 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-
-st.title("Interactive Dataset Exploration")
 
-# Load data
-@st.cache_data
-def load_data():
-    # Data from the catalog.data.gov
-    # Border Crossing Entry Data
-    # https://catalog.data.gov/dataset/border-crossing-entry-data-683ae
-    df = pd.read_csv("data/edgars/Border_Crossing_Entry_Data.csv", parse_dates=["Date"]) # Load file and parse the date colum as a date
+from common.figures import cached_figure
+from common.trace import payload, span
+from common.warmup import placeholder
+from queries import border_crossings
+from queries.border_crossings import CrossingsFilter
 
-    # Pre Processing:
-    # Split the date column into YEAR and MONTH
-    df['Year'] = df['Date'].dt.year
-    df['Month'] = df['Date'].dt.month
-
-    # Drop unwanted columns: LATITUDE, LONGITUDE, POINT
-    df = df.drop(columns=["Latitude", "Longitude", "Point"])
+st.title("Interactive Dataset Exploration")
 
-    return df
+placeholder("border_crossings", "border crossings")
 
-df = load_data()
+min_year, max_year = border_crossings.year_range()
 
 st.header("U.S. Border Crossings Visualization")
-st.markdown(f'Explore inbound crossings at the US-Canada and US-Mexico borders ({int(df["Year"].min())}–{int(df["Year"].max())}).')
+st.markdown(f'Explore inbound crossings at the US-Canada and US-Mexico borders ({min_year}–{max_year}).')
 
 
 # Sidebar with data filters
@@ -33,73 +21,66 @@ with st.sidebar:
     st.header("Data Filters")
 
     # Select type of border crossing e.g. pedestrians, truck, bus
-    selected_measure = st.multiselect("Select U.S. border crossing type:", sorted(df["Measure"].unique()), default=["Pedestrians"])
+    selected_measure = st.multiselect("Select U.S. border crossing type:", border_crossings.categories("Measure"), default=["Pedestrians"])
 
     # Select border (either US-Canada or US-Mexico)
-    selected_border = st.multiselect("Select Border:", df["Border"].unique(), default=df["Border"].unique())
+    selected_border = st.multiselect("Select Border:", border_crossings.categories("Border"), default=border_crossings.categories("Border"))
 
     # Choose year range of data selection
-    year_range = st.slider("Select Year Range:", int(df["Year"].min()), int(df["Year"].max()), (int(df["Year"].min()), int(df["Year"].max())))
+    year_range = st.slider("Select Year Range:", min_year, max_year, (min_year, max_year))
 
-# Apply filters to the data frame
-filtered = df[
-    (df["Measure"].isin(selected_measure)) & # Selected type of crossing
-    (df["Border"].isin(selected_border)) & # Selected border
-    (df["Year"] >= year_range[0]) & # Year range from
-    (df["Year"] <= year_range[1]) # Year range to
-]
+# Filters shared by the data table and both charts
+spec = CrossingsFilter(
+    measures=selected_measure, # Selected type of crossing
+    borders=selected_border, # Selected border
+    years=year_range, # Year range from and to
+)
 
 
 # Toggle to show data in a table view
 if st.checkbox("Show data table:"):
-    st.dataframe(filtered)
+    # Only the table needs the raw rows
+    rows = border_crossings.filter(spec)
+    with span("st.dataframe", **payload(rows)):
+        st.dataframe(rows)
+
+
+# Plotly is slow to import, so it's loaded after the filters and table are rendered
+import plotly.express as px
+
+
+# Figures are cached across sessions by filter and dataset version
+version = border_crossings.version()
 
 
 # CHART FOR BORDER CROSSINGS OVER TIME
 # 1) Prepare the data
-# Group the filtered data by date and sum the Value column to get total crossings per date
-time_series = (
-    filtered.groupby("Date")["Value"]
-    .sum()
-    .reset_index()  # Converts the grouped object back into a DataFrame
-    .sort_values("Date")  # Ensures the data is in chronological order
-)
-
-# Create a line chart with plotly showing total crossings over time
-fig = px.line(
-    time_series,
+# Total crossings per date, rolled up from the pre-aggregated date cube
+# 2) Create a line chart with plotly showing total crossings over time
+fig = cached_figure("crossings-over-time", spec, version, lambda: px.line(
+    border_crossings.aggregate(spec),
     x="Date",         # x-axis: Date
     y="Value",        # y-axis: Total number of crossings
     title="Total Crossings Over Time - Chart"
-)
+))
 
 # Render the plotly chart in the streamlit app
-st.plotly_chart(fig, use_container_width=True)
+with span("st.plotly_chart"):
+    st.plotly_chart(fig, use_container_width=True)
 
 
 # CHART FOR MOST POPULAR CROSSED PORTS
 # 1) Prepare the data
-top_ports = (
-    # Group by port name, aggregating sum for the crossings value and capturing the first border value
-    filtered.groupby("Port Name")
-    .agg({"Value": "sum", "Border": "first"})
-    .reset_index()
-)
-
-# Create a new column that combines the Border and Port Name.
-top_ports["Port Label"] = top_ports["Port Name"] + " | " + top_ports["Border"]
-
-# Sort by value in descending order and pick the top 10 ports
-top_ports = top_ports.sort_values("Value", ascending=False).head(10)
-
+# Top 10 ports by total crossings, labelled "Port Name | Border"
 # 2) Create a horizontal bar chart using the new Port Label column
-fig2 = px.bar(
-    top_ports,
+fig2 = cached_figure("top-ports", spec, version, lambda: px.bar(
+    border_crossings.top_ports(spec, n=10),
     x="Value",           # Bar length = crossing count
     y="Port Label",      # Use the custom label that has the border prefix
     orientation="h",     # Horizontal bars
     title="Top 10 Ports by Total Crossings - Chart"
-)
+))
 
 # Render the plotly chart in streamlit
-st.plotly_chart(fig2, use_container_width=True)
+with span("st.plotly_chart"):
+    st.plotly_chart(fig2, use_container_width=True)
@@ -0,0 +1,186 @@
+import logging
+import os
+import sys
+import time
+from dataclasses import dataclass
+
+import pandas as pd
+
+from common.columnar import cache_path, read_mapped, remove_stale, write_arrow_chunks
+from common.schema import SCHEMAS
+from common.trace import traced
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+DATA_PATH = "data/edgars/Border_Crossing_Entry_Data.csv"
+
+# Latitude, Longitude and Point are never read
+USECOLS = ["Port Name", "State", "Port Code", "Border", "Date", "Measure", "Value"]
+# Dates are parsed per distinct value, see parse_dates
+DTYPES = SCHEMAS["border_crossings"] | {"Date": "category"}
+
+# Monthly dates as published, e.g. "Feb 2025"
+DATE_FORMAT = "%b %Y"
+
+# Finest grain the charts need, everything else is a roll-up of it
+CUBE_KEYS = ["Date", "Measure", "Border", "Port Name"]
+
+CHUNKSIZE = 100_000
+
+# Bump when the ingested frames change so their mapped copies get rebuilt
+INGEST_VERSION = 2
+
+# Cache name of the Arrow file the rows are streamed into
+ROWS_NAME = "crossings-rows"
+
+
+@dataclass
+class IngestReport:
+    rows: int
+    chunks: int
+    seconds: float
+    # Resident memory when the ingest started and the most sampled after any chunk.
+    # Other threads of the process (e.g. the warm-up) count too while they run
+    rss_before_mb: float
+    rss_peak_mb: float
+    # Lifetime peak of the whole process, whatever else it loaded
+    process_peak_rss_mb: float
+
+    def __str__(self) -> str:
+        return (
+            f"{self.rows} rows in {self.chunks} chunks, {self.seconds:.2f}s "
+            f"({self.rows / max(self.seconds, 1e-9):,.0f} rows/s), RSS {self.rss_before_mb:.0f} MB -> "
+            f"peak {self.rss_peak_mb:.0f} MB during ingest (process peak {self.process_peak_rss_mb:.0f} MB)"
+        )
+
+
+@dataclass
+class Ingested:
+    df: pd.DataFrame
+    cube: pd.DataFrame
+    # None when both frames were mapped from an earlier ingest
+    report: IngestReport | None
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.df.memory_usage(deep=True).sum() + self.cube.memory_usage(deep=True).sum())
+
+
+def rss_mb() -> float:
+    # Current resident set size, only available where /proc is
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except (OSError, ValueError, AttributeError):
+        return float("nan")
+
+
+def peak_rss_mb() -> float:
+    if resource is None:
+        return float("nan")
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS and in kilobytes elsewhere
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+def parse_dates(dates: pd.Series) -> pd.Series:
+    # Only the few hundred distinct months get parsed, not every row
+    categories = dates.cat.categories
+    try:
+        parsed = pd.to_datetime(categories, format=DATE_FORMAT)
+    except ValueError:
+        parsed = pd.to_datetime(categories)
+    codes = dates.cat.codes.to_numpy()
+    return pd.Series(pd.Categorical.from_codes(codes, categories=parsed), index=dates.index).astype(parsed.dtype)
+
+
+def compact_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    chunk["Date"] = parse_dates(chunk["Date"])
+    # Split the date column into YEAR and MONTH
+    chunk["Year"] = chunk["Date"].dt.year.astype("int16")
+    chunk["Month"] = chunk["Date"].dt.month.astype("int8")
+    return chunk
+
+
+def build_cube(df: pd.DataFrame) -> pd.DataFrame:
+    # Summed Value per (Date, Measure, Border, Port Name), summed as int64 to avoid overflow
+    cube = (
+        df.assign(Value=df["Value"].astype("int64"))
+        .groupby(CUBE_KEYS, observed=True)["Value"]
+        .sum()
+        .reset_index()
+    )
+    cube["Year"] = cube["Date"].dt.year.astype("int16")
+    return cube
+
+
+def concat_chunks(parts: list[pd.DataFrame]) -> pd.DataFrame:
+    # Align categories first, otherwise concat falls back to object columns
+    parts = list(parts)
+    for column in parts[0].select_dtypes("category").columns:
+        categories = pd.api.types.union_categoricals([p[column] for p in parts]).categories.sort_values()
+        for p in parts:
+            p[column] = p[column].cat.set_categories(categories)
+    return pd.concat(parts, ignore_index=True)
+
+
+def fold_cubes(parts: list[pd.DataFrame]) -> pd.DataFrame:
+    return concat_chunks(parts).groupby(CUBE_KEYS + ["Year"], observed=True)["Value"].sum().reset_index()
+
+
+def rows_path(path: str = DATA_PATH) -> str:
+    return cache_path(path, ROWS_NAME, INGEST_VERSION, ".arrow")
+
+
+@traced
+def ingest(path: str = DATA_PATH, target: str | None = None, chunksize: int = CHUNKSIZE) -> Ingested:
+    """Stream the border crossing CSV in chunks with compact dtypes into the
+    Arrow file `target` (the rows cache by default), folding the (Date,
+    Measure, Border, Port Name) cube as the chunks go by. Only about one
+    chunk and the cube are in memory at a time; the rows are returned
+    mapped from `target`."""
+    target = target or rows_path(path)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    remove_stale(target, ROWS_NAME, ".arrow")
+
+    start = time.perf_counter()
+    rss_before = rss_peak = rss_mb()
+    cube = None
+    pending = []
+    chunks = 0
+
+    def stream():
+        nonlocal cube, pending, chunks, rss_peak
+        for chunk in pd.read_csv(path, usecols=USECOLS, dtype=DTYPES, chunksize=chunksize):
+            chunk = compact_chunk(chunk)
+            pending.append(build_cube(chunk))
+            chunks += 1
+            # Folded once the pending parts outgrow the running cube, so every row is folded a few times at most
+            if cube is None or sum(len(p) for p in pending) > len(cube):
+                cube = fold_cubes(([cube] if cube is not None else []) + pending)
+                pending = []
+            rss_peak = max(rss_peak, rss_mb())
+            yield chunk
+
+    rows = write_arrow_chunks(stream(), target)
+    cube = fold_cubes(([cube] if cube is not None else []) + pending)
+
+    report = IngestReport(
+        rows=rows,
+        chunks=chunks,
+        seconds=time.perf_counter() - start,
+        rss_before_mb=rss_before,
+        rss_peak_mb=max(rss_peak, rss_mb()),
+        process_peak_rss_mb=peak_rss_mb(),
+    )
+    logger.info("Ingested %s: %s", path, report)
+    return Ingested(read_mapped(target), cube, report)
+
+
+if __name__ == "__main__":
+    print(ingest(sys.argv[1] if len(sys.argv) > 1 else DATA_PATH).report)
@@ -1,17 +1,188 @@
-import streamlit as st
+from dataclasses import dataclass
+
 import numpy as np
 import pandas as pd
 
-def save_to_cache(df) -> None:
-    st.session_state.housing = df
+from common.colors import iqr_bounds
+from common.columnar import mapped_frame
+from common.profile import Profile, load_profile as _load_profile, write_profile as _write_profile
+from common.preview import PREVIEW_ROWS, ensure_metadata, read_metadata, read_preview
+from common.schema import compact
+from common.sketch import SketchTable
+from common.store import shared, shared_frame
+from common.trace import traced
+
+DATASET_PATH = "data/georgy/germany_housing.csv"
+POSTCODES_PATH = "data/georgy/de.csv"
+
+RENT_COLUMNS = ["Total rent", "Base rent"]
+
+# Filter keys summarized in the dataset profile
+PROFILE_GROUPS = [["regio1"]]
+
+# Bump when the schema or preprocess_dataset change so cached frames get rebuilt
+RAW_VERSION = 1
+PREPROCESS_VERSION = 3
 
-def load_from_cache() -> pd.DataFrame:
-    return st.session_state.housing
+# Map colour range from the cheapest to the most expensive offers
+RENT_COLOR_LOW = (0, 45, 128, 170)
+RENT_COLOR_HIGH = (255, 45, 128, 170)
+# Postcodes or cells without any listing that states the rent
+RENT_COLOR_MISSING = (128, 128, 128, 90)
 
+
+@traced
+def _parse_dataset() -> pd.DataFrame:
+    return compact(pd.read_csv(DATASET_PATH), "housing")
+
+
+@traced
 def read_dataset() -> pd.DataFrame:
-    return pd.read_csv("data/georgy/germany_housing.csv")
+    # Parsed once per version of the CSV, afterwards mapped from an Arrow file
+    return shared_frame(
+        "georgy/housing-raw",
+        DATASET_PATH,
+        lambda: ensure_metadata(
+            DATASET_PATH,
+            "housing",
+            mapped_frame(DATASET_PATH, "housing-raw", _parse_dataset, version=RAW_VERSION),
+        ),
+    )
+
+
+def read_preview_dataset(nrows: int = PREVIEW_ROWS) -> pd.DataFrame:
+    # First rows only, for the overview page
+    return compact(read_preview(DATASET_PATH, nrows), "housing", "housing-preview")
+
+
+def read_dataset_metadata() -> dict | None:
+    # Written when the full dataset is loaded, None until then
+    return read_metadata(DATASET_PATH, "housing")
+
+
+def _load_preprocessed() -> pd.DataFrame:
+    return mapped_frame(
+        DATASET_PATH,
+        "housing-preprocessed",
+        lambda: preprocess_dataset(read_dataset().copy()),
+        version=PREPROCESS_VERSION,
+    )
+
+
+def read_preprocessed_dataset() -> pd.DataFrame:
+    # Shared by all sessions, must not be modified in place
+    return shared_frame("georgy/housing", DATASET_PATH, _load_preprocessed)
+
+
+@dataclass(frozen=True)
+class PostcodeIndex:
+    """Coordinates of every postcode as sorted int32 keys with float32
+    latitude and longitude arrays, looked up with searchsorted."""
+
+    postcodes: np.ndarray
+    latitude: np.ndarray
+    longitude: np.ndarray
+
+    @property
+    def nbytes(self) -> int:
+        return self.postcodes.nbytes + self.latitude.nbytes + self.longitude.nbytes
+
+    def lookup(self, postcodes, nearest: bool = False) -> tuple[np.ndarray, np.ndarray]:
+        """Latitude and longitude of every postcode as float64, NaN where
+        unknown. With `nearest`, postcodes missing from the index get the
+        coordinates of the numerically closest one, which is usually a
+        neighbouring area."""
+        codes = pd.to_numeric(np.asarray(postcodes), errors="coerce").astype("float64")
+        valid = np.isfinite(codes)
+        keys = np.where(valid, codes, 0).astype(np.int32)
+
+        right = np.searchsorted(self.postcodes, keys).clip(max=len(self.postcodes) - 1)
+        found = valid & (self.postcodes[right] == keys)
+        if nearest:
+            left = (right - 1).clip(min=0)
+            closer = np.abs(self.postcodes[left] - keys) < np.abs(self.postcodes[right] - keys)
+            right = np.where(found, right, np.where(closer, left, right))
+            found = valid
+
+        # st.map can't serialize the float32 scalars it derives from float32 columns
+        latitude = np.where(found, self.latitude[right], np.nan).astype(np.float64)
+        longitude = np.where(found, self.longitude[right], np.nan).astype(np.float64)
+        return latitude, longitude
+
+
+def _parse_postcodes() -> PostcodeIndex:
+    # de.csv lists some postcodes more than once, those get their mean position
+    geo_df = pd.read_csv(
+        POSTCODES_PATH,
+        dtype={"postcode": "int32", "latitude": "float32", "longitude": "float32"},
+    )
+    geo_df = geo_df.dropna().groupby("postcode", sort=True).mean()
+    return PostcodeIndex(
+        geo_df.index.to_numpy(np.int32),
+        geo_df["latitude"].to_numpy(np.float32),
+        geo_df["longitude"].to_numpy(np.float32),
+    )
+
+
+def read_postcodes() -> PostcodeIndex:
+    return shared("georgy/postcodes", POSTCODES_PATH, _parse_postcodes)
+
+
+def _aggregate_rents(groups, stats: list[str]) -> pd.DataFrame:
+    agg = groups[RENT_COLUMNS].agg(stats)
+    agg.columns = [f"{col} {stat}" for col, stat in agg.columns]
+    return agg
+
+
+@traced
+def build_postcode_index(df: pd.DataFrame, postcodes: PostcodeIndex, nearest: bool = True) -> pd.DataFrame:
+    """Rent statistics per (Bundesland, postcode), joined with the postcode
+    coordinates and indexed by Bundesland ("All" included)."""
+    stats = ["count", "sum", "mean", "median"]
+
+    by_state = df.groupby(["regio1", "geo_plz"], observed=True)
+    per_state = _aggregate_rents(by_state, stats).reset_index()
+
+    overall = df.groupby("geo_plz", observed=True)
+    per_all = _aggregate_rents(overall, stats).reset_index()
+    per_all.insert(0, "regio1", "All")
 
+    index = pd.concat([per_all, per_state], ignore_index=True)
+    index["regio1"] = index["regio1"].astype(str)
 
+    # Postcodes missing from de.csv are placed at the nearest known one unless `nearest` is off
+    index["latitude"], index["longitude"] = postcodes.lookup(index["geo_plz"], nearest=nearest)
+    index = index.dropna(subset=["latitude", "longitude"])
+    index = index.set_index("regio1").sort_index()
+    # Every selection is coloured on the scale of the whole dataset, see rent_color_bounds
+    index.attrs["color_bounds"] = rent_color_bounds(df)
+    return index
+
+
+def rent_color_bounds(df: pd.DataFrame) -> dict[str, tuple[float, float]]:
+    # Range of log(rent + 1) over every listing, outliers beyond 1.5 IQR clipped
+    return {col: iqr_bounds(np.log1p(df[col].astype("float64"))) for col in RENT_COLUMNS}
+
+
+def read_postcode_index() -> pd.DataFrame:
+    # Built once per dataset version, pages only look rows up by Bundesland
+    return shared_frame(
+        "georgy/postcode-index",
+        [DATASET_PATH, POSTCODES_PATH],
+        lambda: build_postcode_index(read_preprocessed_dataset(), read_postcodes()),
+    )
+
+
+def read_rent_sketches() -> SketchTable:
+    # Rent distribution per Bundesland, merged for "All"
+    return shared(
+        "georgy/rent-sketches",
+        DATASET_PATH,
+        lambda: SketchTable(read_preprocessed_dataset(), ["regio1"], RENT_COLUMNS),
+    )
+
+
+@traced
 def preprocess_dataset(df: pd.DataFrame) -> pd.DataFrame:
     df.drop([
         "heatingType",
@@ -30,32 +201,28 @@ def preprocess_dataset(df: pd.DataFrame) -> pd.DataFrame:
 
     df["baseRent"].dropna()
 
-    df["rent_transf"] = np.log(df["baseRent"] + 1)
-
-    perc25 = df["rent_transf"].quantile(0.25)
-    perc75 = df["rent_transf"].quantile(0.75)
-
-    # Interquartile range
-    iqr = perc75 - perc25
+    df.rename(columns={"totalRent": "Total rent"}, inplace=True)
+    df.rename(columns={"baseRent": "Base rent"}, inplace=True)
 
-    lower = perc25 - 1.5 * iqr
-    upper = perc75 + 1.5 * iqr
+    return df
 
-    df['rent_transf'] = df['rent_transf'].clip(lower=lower, upper=upper)
+def write_profile() -> str:
+    return _write_profile(DATASET_PATH, "housing", read_preprocessed_dataset(), PROFILE_GROUPS, RENT_COLUMNS)
 
-    rent_transf = np.array(df['rent_transf']).reshape(-1, 1)
-    
-    min_val = rent_transf.min()
-    max_val = rent_transf.max()
-    rent_transf = (rent_transf - min_val) / (max_val - min_val)
 
-    df["rent_transf"] = rent_transf
+def load_profile() -> Profile | None:
+    return _load_profile(DATASET_PATH, "housing")
 
-    df['color'] = df['rent_transf'].apply(lambda x: (int(x * 255), 45, 128, 170))
 
-    df.rename(columns={"totalRent": "Total rent"}, inplace=True)
-    df.rename(columns={"baseRent": "Base rent"}, inplace=True)
-    
-    save_to_cache(df)
+def rent_stats(bundesland: str, rent_price: str) -> dict:
+    # Mean and median, from the profile when it covers the selection
+    profile = load_profile()
+    if profile is not None:
+        if bundesland == "All":
+            stats = profile.column(rent_price)
+        else:
+            stats = profile.group(["regio1"], (bundesland,), rent_price)
+        if stats:
+            return stats
 
-    return df
\ No newline at end of file
+    return read_rent_sketches().summary(rent_price, regio1=None if bundesland == "All" else bundesland)
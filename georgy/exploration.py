@@ -1,25 +1,18 @@
 import streamlit as st
-import pandas as pd
 
-from georgy.common import preprocess_dataset, read_dataset
+from common.trace import payload, span
+from common.warmup import placeholder
+from queries import housing
+from queries.housing import HousingFilter
 
 st.title("Rental offers in Germany 🇩🇪")
 
 currency = "€"
 
 def visualize():
-    if "housing" not in st.session_state:
-        df = read_dataset()
-        df = preprocess_dataset(df)
-    else:
-        df = st.session_state.housing
+    placeholder("housing", "rental offers")
 
-    states = ['All', 'Nordrhein_Westfalen', 'Rheinland_Pfalz', 'Sachsen', 'Bremen',
-             'Schleswig_Holstein', 'Baden_Württemberg', 'Thüringen', 'Hessen',
-             'Niedersachsen', 'Bayern', 'Hamburg', 'Sachsen_Anhalt',
-             'Mecklenburg_Vorpommern', 'Berlin', 'Brandenburg', 'Saarland']
-
-    bundesland = st.selectbox("Bundesland", format_func=lambda x: x.replace("_", " "), options=states)
+    bundesland = st.selectbox("Bundesland", format_func=lambda x: x.replace("_", " "), options=housing.STATES)
 
     rent_price = st.radio(
         "Rent price",
@@ -30,33 +23,26 @@ def visualize():
         ],
     )
 
-    if bundesland != 'All':
-        df = df[df['regio1'] == bundesland]
+    spec = HousingFilter(bundesland, rent_price)
+    stats = housing.aggregate(spec)
 
     price_metrics_cols = st.columns(2)
-    price_metrics_cols[0].metric("Average", f"{currency}{df[rent_price].mean():.2f}", border=True)
-    price_metrics_cols[1].metric("Median", f"{currency}{df[rent_price].median():.2f}", border=True)
-
-    postcode_avg = (
-        df.groupby("geo_plz")
-        .agg(avg_totalRent=("Total rent", "mean"),
-             color=("color", "first"),)
-        .reset_index()
-    )
-
-    geo_df = pd.read_csv("data/georgy/de.csv", delimiter=",")
-    geo_df["latitude"] = pd.to_numeric(geo_df["latitude"])
-    geo_df["longitude"] = pd.to_numeric(geo_df["longitude"])
+    price_metrics_cols[0].metric("Average", f"{currency}{stats['mean']:.2f}", border=True)
+    price_metrics_cols[1].metric("Median", f"{currency}{stats['median']:.2f}", border=True)
 
-    merged_df = pd.merge(postcode_avg, geo_df, left_on="geo_plz", right_on="postcode", how="inner")
-    merged_df = merged_df.dropna()
-    if merged_df.empty:
+    if housing.filter(spec).empty:
         st.error(
             "Bad merge")
         st.stop()
 
-    st.map(merged_df.rename(columns={"lng": "lon", "lat": "lat"}),
-           color='color')
+    layer = housing.map_layer(spec)
+    with span("st.map", **payload(layer.points)):
+        st.map(layer.points,
+               latitude="latitude",
+               longitude="longitude",
+               color='color',
+               size=layer.size,
+               zoom=layer.zoom)
 
 
 if __name__ == "__main__":
@@ -1,8 +1,5 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
 
-from georgy.common import preprocess_dataset, read_dataset
 # from sklearn.preprocessing import MinMaxScaler
 
 st.title("Dataset overview and preparation")
@@ -38,9 +35,20 @@ st.markdown(
     """
 )
 
-df = read_dataset()
+# Imported here so the text above renders before pandas is loaded
+from common.preview import columns_frame
+from georgy.common import preprocess_dataset, read_dataset_metadata, read_preview_dataset
+
+# Only the first rows are read, the full dataset is never loaded on this page
+df = read_preview_dataset()
 st.dataframe(df.head())
 
+metadata = read_dataset_metadata()
+if metadata is not None:
+    st.caption(f"{metadata['rows']:,} rows, {len(metadata['columns'])} columns")
+    with st.expander("Column types and missing values"):
+        st.dataframe(columns_frame(metadata))
+
 st.header("Data pre-processing")
 
 st.subheader("⚙️ Pre-processing strategy")
@@ -53,9 +61,9 @@ st.markdown(
         - We remove it if it doesn't have much relevance for this analysis
         - We keep it to display if it is relevant at any point
         - Rows with missing values for baseRent are dropped.
-        - log2 transformation is applied in a new column for the color scheme
-        - MinMax scaling is applied for the color column
+        - For the map's color scheme, a log transformation is applied to the rent
         - Using IQR we clip outliers, equating them to the lower and upper bounds
+        - MinMax scaling over the whole dataset maps the result to a color
     2. Remove irrelevant variables:
         - Some of the variables are out of the scope of this analysis
         - "Description" and "Facilities" columns have already been dropped to lower the size of the dataset
@@ -67,6 +75,6 @@ st.markdown(
 
 st.subheader("☑ Dataset after pre-processing")
 
-df = preprocess_dataset(df)
+df = preprocess_dataset(df.copy())
 st.dataframe(df.head())
 
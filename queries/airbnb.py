@@ -0,0 +1,73 @@
+"""Airbnb listings in European cities."""
+from dataclasses import dataclass
+
+import pandas as pd
+
+from artyom.common import Cities, load_cities, preprocess_dataset, price_stats
+from common.binning import bin_points, cell_radius, fit_zoom
+from common.colors import color_column
+from common.trace import traced
+from queries.base import FilterSpec, MapLayer
+
+METRICS = ["realSum", "guest_satisfaction_overall"]
+
+# Red scales with the metric relative to its maximum
+COLOR_LOW = (0, 100, 150, 255)
+COLOR_HIGH = (255, 100, 150, 255)
+
+
+@dataclass(frozen=True)
+class AirbnbFilter(FilterSpec):
+    cities: tuple[str, ...] = ()
+    room_type: str | None = None
+
+
+@traced
+def load() -> Cities:
+    return load_cities()
+
+
+@traced
+def preprocess(df: pd.DataFrame) -> pd.DataFrame:
+    return preprocess_dataset(df)
+
+
+def cities() -> list[str]:
+    return load_cities().names
+
+
+def room_types() -> list[str]:
+    return load_cities().index.categories["room_type"].tolist()
+
+
+@traced
+def filter(spec: AirbnbFilter) -> pd.DataFrame:
+    return load_cities().select(list(spec.cities), spec.room_type)
+
+
+@traced
+def aggregate(spec: AirbnbFilter) -> pd.DataFrame:
+    # Price statistics per selected city
+    return pd.DataFrame(
+        [price_stats([city], spec.room_type) for city in spec.cities],
+        index=pd.Index(spec.cities, name="city"),
+        columns=["median", "max", "min", "mean"],
+    )
+
+
+@traced
+def map_layer(spec: AirbnbFilter, size: str, color: str) -> MapLayer:
+    points = filter(spec).rename(columns={"lng": "lon"})
+    zoom = fit_zoom(points)
+    # Coloured after binning, so a cell's colour is that of its points' mean
+    binned = bin_points(points, zoom, mean=list(dict.fromkeys([size, color])))
+    binned = binned.assign(color_metric=color_column(binned[color], COLOR_LOW, COLOR_HIGH, method="max"))
+    # Binned cells are far larger than `size` in metres, so they are drawn at the cell's radius
+    return MapLayer(binned, zoom, cell_radius(zoom) if len(binned) < len(points) else None)
+
+
+def warm() -> None:
+    # Everything the default view needs, see common.warmup
+    spec = AirbnbFilter(cities()[:1])
+    aggregate(spec)
+    map_layer(spec, METRICS[0], METRICS[0])
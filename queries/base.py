@@ -0,0 +1,49 @@
+import hashlib
+import json
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, field, fields
+
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class FilterSpec:
+    """Base of every dataset's filter spec.
+
+    Specs are frozen and every collection field (list, set, tuple, array,
+    ...) is stored as a sorted tuple of plain Python values, so two specs
+    selecting the same rows are equal and hash the same, whatever order
+    the widgets returned the values in. Fields declared with `ordered()`,
+    such as ranges, keep their order.
+    """
+
+    def __post_init__(self):
+        for f in fields(self):
+            value = getattr(self, f.name)
+            if value is None or isinstance(value, (str, bytes)) or not isinstance(value, Iterable):
+                continue
+            # numpy arrays and pandas objects hold numpy scalars, tolist() makes them plain
+            value = tuple(value.tolist() if hasattr(value, "tolist") else value)
+            if not f.metadata.get("ordered"):
+                value = tuple(sorted(value))
+            object.__setattr__(self, f.name, value)
+
+    def key(self) -> str:
+        # Stable across processes, unlike hash()
+        payload = json.dumps({"spec": type(self).__name__, **asdict(self)}, sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+
+def ordered(default=None):
+    # A spec field whose values keep their order, e.g. a (low, high) range
+    return field(default=default, metadata={"ordered": True})
+
+
+@dataclass
+class MapLayer:
+    """Points ready for st.map, binned for the initial zoom when large.
+    `size` is the cell radius in metres for binned layers, otherwise None."""
+
+    points: pd.DataFrame
+    zoom: int
+    size: float | None = None
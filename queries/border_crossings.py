@@ -0,0 +1,92 @@
+"""Inbound crossings at the US-Canada and US-Mexico borders."""
+from dataclasses import dataclass
+
+import pandas as pd
+
+from common.columnar import file_hash
+from common.trace import traced
+from edgars.common import load_data, load_filter_index, load_port_cube, load_profile, load_time_cube
+from edgars.ingest import DATA_PATH, DTYPES, INGEST_VERSION, USECOLS, compact_chunk
+from queries.base import FilterSpec, ordered
+
+
+@dataclass(frozen=True)
+class CrossingsFilter(FilterSpec):
+    measures: tuple[str, ...] = ()
+    borders: tuple[str, ...] = ()
+    years: tuple[int, int] | None = ordered()
+
+    def selection(self) -> dict:
+        # Keyword arguments of FilterIndex.select
+        return dict(
+            isin={"Measure": list(self.measures), "Border": list(self.borders)},
+            between={} if self.years is None else {"Year": self.years},
+        )
+
+
+@traced
+def load() -> pd.DataFrame:
+    return load_data()
+
+
+@traced
+def preprocess(df: pd.DataFrame) -> pd.DataFrame:
+    # A frame as read from the CSV (or from load), prepared the way ingest prepares each chunk
+    return compact_chunk(df[USECOLS].astype(DTYPES))
+
+
+def version() -> str:
+    # Changes with the CSV and with what ingest produces from it
+    return f"{file_hash(DATA_PATH)}-v{INGEST_VERSION}"
+
+
+def categories(column: str) -> list:
+    return list(load_filter_index().categories[column])
+
+
+@traced
+def year_range() -> tuple[int, int]:
+    # From the dataset profile when there is one
+    profile = load_profile()
+    if profile is not None:
+        years = profile.column("Year")
+        return int(years["min"]), int(years["max"])
+    years = load_filter_index().categories["Year"]
+    return int(years[0]), int(years[-1])
+
+
+@traced
+def filter(spec: CrossingsFilter) -> pd.DataFrame:
+    return load_filter_index().select(**spec.selection())
+
+
+@traced
+def aggregate(spec: CrossingsFilter) -> pd.DataFrame:
+    # Total crossings per date, in chronological order
+    return (
+        load_time_cube().select(**spec.selection())
+        .groupby("Date")["Value"]
+        .sum()
+        .reset_index()
+        .sort_values("Date")
+    )
+
+
+@traced
+def top_ports(spec: CrossingsFilter, n: int = 10) -> pd.DataFrame:
+    # The n ports with most crossings, labelled with their border
+    ports = (
+        load_port_cube().select(**spec.selection())
+        .groupby("Port Name", observed=True)
+        .agg({"Value": "sum", "Border": "first"})
+        .reset_index()
+    )
+    ports["Port Label"] = ports["Port Name"].astype(str) + " | " + ports["Border"].astype(str)
+    return ports.sort_values("Value", ascending=False).head(n)
+
+
+def warm() -> None:
+    # Everything the default view needs, see common.warmup
+    spec = CrossingsFilter(["Pedestrians"], categories("Border"), year_range())
+    aggregate(spec)
+    top_ports(spec)
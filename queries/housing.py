@@ -0,0 +1,88 @@
+"""Rental offers in Germany."""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from common.binning import bin_points, cell_radius, fit_zoom
+from common.colors import color_column
+from common.trace import traced
+from georgy.common import (
+    RENT_COLOR_HIGH,
+    RENT_COLOR_LOW,
+    RENT_COLOR_MISSING,
+    RENT_COLUMNS,
+    preprocess_dataset,
+    read_dataset,
+    read_postcode_index,
+    read_preprocessed_dataset,
+    rent_stats,
+)
+from queries.base import FilterSpec, MapLayer
+
+ALL = "All"
+STATES = [ALL, 'Nordrhein_Westfalen', 'Rheinland_Pfalz', 'Sachsen', 'Bremen',
+          'Schleswig_Holstein', 'Baden_Württemberg', 'Thüringen', 'Hessen',
+          'Niedersachsen', 'Bayern', 'Hamburg', 'Sachsen_Anhalt',
+          'Mecklenburg_Vorpommern', 'Berlin', 'Brandenburg', 'Saarland']
+
+
+@dataclass(frozen=True)
+class HousingFilter(FilterSpec):
+    bundesland: str = ALL
+    rent: str = RENT_COLUMNS[0]
+
+
+@traced
+def load() -> pd.DataFrame:
+    return read_dataset()
+
+
+@traced
+def preprocess(df: pd.DataFrame) -> pd.DataFrame:
+    return preprocess_dataset(df.copy())
+
+
+@traced
+def prepared() -> pd.DataFrame:
+    # Preprocessed once per dataset version and shared, must not be modified in place
+    return read_preprocessed_dataset()
+
+
+@traced
+def filter(spec: HousingFilter) -> pd.DataFrame:
+    # Rent statistics and coordinates per postcode of the Bundesland
+    index = read_postcode_index()
+    return index.loc[[spec.bundesland]] if spec.bundesland in index.index else index.iloc[:0]
+
+
+@traced
+def aggregate(spec: HousingFilter) -> dict:
+    # Mean and median rent of the Bundesland
+    return rent_stats(spec.bundesland, spec.rent)
+
+
+@traced
+def map_layer(spec: HousingFilter) -> MapLayer:
+    points = filter(spec)
+    zoom = fit_zoom(points, "latitude", "longitude")
+    binned = bin_points(points, zoom, "latitude", "longitude", mean=[f"{spec.rent} mean"])
+    # Coloured after binning from the log of the cell's mean rent, on fixed bounds so
+    # a rent has the same colour in every selection
+    bounds = read_postcode_index().attrs["color_bounds"][spec.rent]
+    color = color_column(
+        np.log1p(binned[f"{spec.rent} mean"].astype("float64")),
+        RENT_COLOR_LOW,
+        RENT_COLOR_HIGH,
+        bounds=bounds,
+        missing=RENT_COLOR_MISSING,
+    )
+    binned = binned.assign(color=color)
+    return MapLayer(binned, zoom, cell_radius(zoom) if len(binned) < len(points) else None)
+
+
+def warm() -> None:
+    # Everything the default view needs, see common.warmup
+    spec = HousingFilter()
+    aggregate(spec)
+    map_layer(spec)
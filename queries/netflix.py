@@ -0,0 +1,91 @@
+"""Netflix movies and TV shows."""
+from dataclasses import astuple, dataclass
+
+import pandas as pd
+
+from andrii.common import load_country_map, load_data, load_index, load_search_index, preprocess_data, value_counts
+from common.binning import bin_points
+from common.trace import traced
+from queries.base import FilterSpec
+
+FACETS = {
+    "cast": "Actor",
+    "listed_in": "Genre",
+    "country": "Country",
+    "director": "Director",
+}
+
+# Largest circle on the country map, in metres
+MAX_RADIUS = 500000
+
+# Options a facet's multiselect sends to the browser on every rerun at most.
+# Cast and directors have thousands of values, only the most frequent are offered
+MAX_OPTIONS = 500
+
+
+@dataclass(frozen=True)
+class TitlesFilter(FilterSpec):
+    cast: tuple[str, ...] = ()
+    listed_in: tuple[str, ...] = ()
+    country: tuple[str, ...] = ()
+    director: tuple[str, ...] = ()
+
+    @property
+    def active(self) -> bool:
+        return any(astuple(self))
+
+
+@traced
+def load() -> pd.DataFrame:
+    return load_data()
+
+
+@traced
+def preprocess(df: pd.DataFrame) -> pd.DataFrame:
+    return preprocess_data(df)
+
+
+def facet_values(facet: str, limit: int | None = None) -> list[str]:
+    # Every value in order, or the `limit` linked to the most titles when there are more
+    values = load_index().facets[facet]
+    if limit is not None and len(values.values) > limit:
+        return values.counts().head(limit).index.tolist()
+    return values.values.tolist()
+
+
+@traced
+def filter(spec: TitlesFilter) -> pd.DataFrame:
+    # Titles matching every facet with a selection, all titles when none has one
+    if not spec.active:
+        return load_data()
+    return load_index().select(**{facet: list(values) for facet, values in vars(spec).items()})
+
+
+@traced
+def aggregate(spec: TitlesFilter, column: str) -> pd.Series:
+    # Titles per value of `column`
+    if not spec.active:
+        return value_counts(load_data(), column)
+    return filter(spec)[column].value_counts()
+
+
+@traced
+def search(query: str) -> pd.DataFrame:
+    positions, scores = load_search_index().search(query)
+    return load_data().iloc[positions][['title', 'type', 'release_year', 'description']].assign(score=scores)
+
+
+@traced
+def country_map() -> pd.DataFrame:
+    # Titles per country at its centroid, binned when the layer grows past MAX_RAW_POINTS
+    points = bin_points(load_country_map(), zoom=1, sum=['count'], first=['country'])
+    return points.assign(size=points['count'] / points['count'].max() * MAX_RADIUS)
+
+
+def warm() -> None:
+    # Everything the default view needs, see common.warmup
+    load_search_index()
+    for column in ["type", "country", "release_year"]:
+        aggregate(TitlesFilter(), column)
+    facet_values("country")
+    country_map()